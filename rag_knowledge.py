@@ -16,16 +16,18 @@ Cách hoạt động:
 
 import json
 import os
+from importlib.util import find_spec
 import numpy as np
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Iterator, Optional, Tuple
 import logging
 from dataclasses import dataclass
 
+# openai chỉ import khi tạo client lần đầu (import openai mất ~0.4s),
+# ở đây chỉ kiểm tra package có cài hay không
 try:
-    import openai
     from dotenv import load_dotenv
     load_dotenv()
-    HAS_OPENAI = True
+    HAS_OPENAI = find_spec("openai") is not None
 except ImportError:
     HAS_OPENAI = False
 
@@ -215,6 +217,11 @@ class Document:
     metadata: Dict
 
 
+# Số documents mỗi request embeddings (API nhận list input)
+EMBEDDING_MODEL = "text-embedding-3-small"
+EMBEDDING_BATCH_SIZE = 100
+
+
 class SimpleVectorStore:
     """
     Simple in-memory vector store.
@@ -223,47 +230,86 @@ class SimpleVectorStore:
     
     def __init__(self):
         self.documents: List[Document] = []
-        self.embeddings: List[List[float]] = []
+        # Embeddings dạng float32 (một hàng / document) thay vì list Python float
+        self.embeddings: np.ndarray = np.zeros((0, 0), dtype=np.float32)
         self.is_initialized = False
         self._client = None
+        # Ma trận embeddings đã normalize (một hàng / document), build lại khi thêm document
+        self._matrix: Optional[np.ndarray] = None
+        self._doc_types: Optional[np.ndarray] = None
     
     def _get_client(self):
         """Lazy load OpenAI client"""
         if self._client is None and HAS_OPENAI:
             api_key = os.getenv('OPENAI_API_KEY')
             if api_key:
+                import openai
                 self._client = openai.OpenAI(api_key=api_key)
         return self._client
     
-    def _get_embedding(self, text: str) -> Optional[List[float]]:
-        """Get embedding từ OpenAI"""
+    def _iter_embedding_batches(self, texts: List[str]) -> Iterator[Tuple[int, np.ndarray]]:
+        """
+        Embed texts từ OpenAI, mỗi request một batch.
+        Yield (start, embeddings float32) cho mỗi batch thành công; batch lỗi được log
+        rồi bỏ qua, các batch còn lại vẫn chạy.
+        """
         client = self._get_client()
         if not client:
             logger.warning("OpenAI client not available")
+            return
+        
+        for start in range(0, len(texts), EMBEDDING_BATCH_SIZE):
+            try:
+                response = client.embeddings.create(
+                    model=EMBEDDING_MODEL,
+                    input=[text[:8000] for text in texts[start:start + EMBEDDING_BATCH_SIZE]]  # Limit text length
+                )
+                embeddings = np.asarray(
+                    [item.embedding for item in sorted(response.data, key=lambda d: d.index)],
+                    dtype=np.float32
+                )
+            except Exception as e:
+                logger.error(f"Embedding error: {e}")
+                continue
+            yield start, embeddings
+    
+    def _get_embeddings(self, texts: List[str]) -> Optional[np.ndarray]:
+        """Get embeddings (float32, một hàng / text), None nếu có batch lỗi"""
+        batches = [embeddings for _, embeddings in self._iter_embedding_batches(texts)]
+        if sum(len(embeddings) for embeddings in batches) != len(texts) or not batches:
             return None
-            
-        try:
-            response = client.embeddings.create(
-                model="text-embedding-3-small",
-                input=text[:8000]  # Limit text length
-            )
-            return response.data[0].embedding
-        except Exception as e:
-            logger.error(f"Embedding error: {e}")
-            return None
+        return np.vstack(batches)
+    
+    def _get_embedding(self, text: str) -> Optional[np.ndarray]:
+        """Get embedding từ OpenAI"""
+        embeddings = self._get_embeddings([text])
+        return embeddings[0] if embeddings is not None else None
     
-    def _cosine_similarity(self, vec1: List[float], vec2: List[float]) -> float:
-        """Calculate cosine similarity"""
-        vec1 = np.array(vec1)
-        vec2 = np.array(vec2)
-        return float(np.dot(vec1, vec2) / (np.linalg.norm(vec1) * np.linalg.norm(vec2)))
+    def _get_matrix(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Ma trận embeddings đã L2-normalize và doc types, build lazily"""
+        if self._matrix is None:
+            self._matrix = self.embeddings / np.linalg.norm(self.embeddings, axis=1, keepdims=True)
+            self._doc_types = np.array([doc.doc_type for doc in self.documents])
+        return self._matrix, self._doc_types
     
     def add_document(self, doc: Document):
         """Add document với embedding"""
-        embedding = self._get_embedding(doc.content)
-        if embedding:
-            self.documents.append(doc)
-            self.embeddings.append(embedding)
+        self.add_documents([doc])
+    
+    def add_documents(self, docs: List[Document]):
+        """
+        Add nhiều documents, embed theo batch thay vì một request / document.
+        Batch embed lỗi chỉ bỏ documents của batch đó.
+        """
+        if not docs:
+            return
+        for start, embeddings in self._iter_embedding_batches([doc.content for doc in docs]):
+            self.documents.extend(docs[start:start + len(embeddings)])
+            if self.embeddings.size:
+                self.embeddings = np.vstack([self.embeddings, embeddings])
+            else:
+                self.embeddings = embeddings
+            self._matrix = None
     
     def search(self, query: str, top_k: int = 5, doc_type: Optional[str] = None) -> List[Tuple[Document, float]]:
         """
@@ -275,24 +321,30 @@ class SimpleVectorStore:
             doc_type: Filter by document type (optional)
         """
         query_embedding = self._get_embedding(query)
-        if not query_embedding:
+        if query_embedding is None or not self.documents:
             return []
         
-        results = []
-        for i, doc_embedding in enumerate(self.embeddings):
-            doc = self.documents[i]
-            
-            # Filter by type if specified
-            if doc_type and doc.doc_type != doc_type:
-                continue
-                
-            similarity = self._cosine_similarity(query_embedding, doc_embedding)
-            results.append((doc, similarity))
+        matrix, doc_types = self._get_matrix()
+        
+        # Cosine similarity với mọi document trong một phép matmul
+        similarities = matrix @ (query_embedding / np.linalg.norm(query_embedding))
         
-        # Sort by similarity
-        results.sort(key=lambda x: x[1], reverse=True)
+        # Filter by type if specified
+        if doc_type:
+            candidates = np.flatnonzero(doc_types == doc_type)
+        else:
+            candidates = np.arange(len(self.documents))
         
-        return results[:top_k]
+        # Sort by similarity: chỉ chọn top_k (O(N)) rồi sort phần đã chọn
+        scores = similarities[candidates]
+        if 0 < top_k < len(candidates):
+            top = np.argpartition(-scores, top_k - 1)[:top_k]
+            top = top[np.lexsort((top, -scores[top]))]
+        else:
+            top = np.argsort(-scores, kind="stable")[:top_k]
+        order = candidates[top]
+        
+        return [(self.documents[i], float(similarities[i])) for i in order]
     
     def initialize(self):
         """
@@ -305,6 +357,8 @@ class SimpleVectorStore:
         
         logger.info("📚 Initializing RAG Vector Store...")
         
+        documents: List[Document] = []
+        
         # 1. Load skills từ ontology
         all_skills = get_all_skills()
         for skill in all_skills:
@@ -319,7 +373,7 @@ CV Tips: {skill.cv_tips}
 Market Demand: {skill.market_demand.value}
 Salary Range: {skill.salary_range_vnd}
 """
-            self.add_document(Document(
+            documents.append(Document(
                 id=f"skill_{skill.id}",
                 content=content,
                 doc_type="skill",
@@ -339,7 +393,7 @@ Salary Range: {path['salary_range']}
 Focus: {path['focus']}
 Next Step: {path['next_step']}
 """
-            self.add_document(Document(
+            documents.append(Document(
                 id=f"career_{path['id']}",
                 content=content,
                 doc_type="career_path",
@@ -355,13 +409,16 @@ Description: {tip['description']}
 Examples: {'; '.join(tip['examples'])}
 Impact: {tip['impact']}
 """
-            self.add_document(Document(
+            documents.append(Document(
                 id=f"tip_{tip['id']}",
                 content=content,
                 doc_type="resume_tip",
                 metadata=tip
             ))
         
+        # Embed tất cả documents theo batch
+        self.add_documents(documents)
+        
         self.is_initialized = True
         logger.info(f"✅ Loaded {len(self.documents)} documents into vector store")
 
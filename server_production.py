@@ -10,8 +10,9 @@ Deploy-ready cho AWS EC2
 from fastapi import FastAPI, HTTPException, UploadFile, File, Form
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, ConfigDict
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple, Iterable, Iterator
 import openai
+import httpx
 import json
 import pdfplumber
 import io
@@ -19,8 +20,24 @@ import uvicorn
 import logging
 from datetime import datetime
 import os
+from functools import lru_cache
 from dotenv import load_dotenv
 
+# orjson (Rust) nhanh hơn stdlib json cho cả parse LLM output lẫn serialize,
+# mặc định UTF-8 nên không cần ensure_ascii=False
+try:
+    import orjson
+
+    def json_dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+
+    json_loads = orjson.loads
+except ImportError:
+    def json_dumps(obj) -> str:
+        return json.dumps(obj, ensure_ascii=False)
+
+    json_loads = json.loads
+
 # Import skill processing modules
 try:
     from skill_processor import (
@@ -76,13 +93,34 @@ app.add_middleware(
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
 if not OPENAI_API_KEY:
     raise ValueError("OPENAI_API_KEY not found in environment variables. Please set it in .env file")
-client = openai.OpenAI(api_key=OPENAI_API_KEY)
+# Shared HTTP client: giữ connection pool + HTTP/2 keep-alive giữa các LLM calls,
+# tránh TCP/TLS handshake mới cho mỗi request. DefaultHttpxClient giữ timeout /
+# redirect mặc định của SDK. Sống cùng process, không đóng ở app shutdown (app có thể
+# startup lại trong cùng process: reload, TestClient)
+http_client = openai.DefaultHttpxClient(
+    http2=True,
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=50)
+)
+client = openai.OpenAI(api_key=OPENAI_API_KEY, http_client=http_client)
 
 # LGIR Parameters
 KAPPA_1 = 5  # Many-shot threshold
 KAPPA_2 = 2  # Few-shot threshold
 TEMPERATURE = 0.0  # Deterministic scoring
 
+# Scoring weights - thứ tự khớp với _SCORE_KEYS
+_SCORE_KEYS = (
+    "skills_score",
+    "experience_score",
+    "education_score",
+    "completeness_score",
+    "job_alignment_score",
+    "presentation_score",
+)
+_EVALUATE_WEIGHTS = (0.25, 0.25, 0.15, 0.15, 0.10, 0.10)
+# Skill alignment quan trọng hơn khi có explicit gap analysis
+_EVALUATE_WITH_JD_WEIGHTS = (0.25, 0.20, 0.10, 0.10, 0.25, 0.10)
+
 
 # ============================================================================
 # Data Models
@@ -288,6 +326,82 @@ def call_llm(messages: List[Dict], max_tokens: int = 1000) -> str:
         raise
 
 
+def iter_cv_edits(raw_edits: Iterable[Dict]) -> Iterator[CVEdit]:
+    """
+    Chuẩn hóa từng cv_edit dict từ LLM thành CVEdit.
+    
+    Nhận iterable và yield từng edit ngay khi validate xong, nên có thể
+    feed trực tiếp từ incremental JSON parser thay vì đợi toàn bộ list.
+    Edit không hợp lệ sẽ bị bỏ qua.
+    """
+    for edit in raw_edits:
+        # Xử lý suggested_value: convert sang string nếu là list/dict
+        suggested_val = edit.get("suggested_value", "")
+        if isinstance(suggested_val, (list, dict)):
+            suggested_val = json_dumps(suggested_val)
+        elif suggested_val is None:
+            suggested_val = ""
+        else:
+            suggested_val = str(suggested_val)
+        
+        # Xử lý current_value tương tự
+        current_val = edit.get("current_value")
+        if isinstance(current_val, (list, dict)):
+            current_val = json_dumps(current_val)
+        elif current_val is not None:
+            current_val = str(current_val)
+        
+        try:
+            yield CVEdit(
+                field_path=edit.get("field_path", ""),
+                action=edit.get("action", "add"),
+                current_value=current_val,
+                suggested_value=suggested_val,
+                reason=edit.get("reason", ""),
+                priority=edit.get("priority", "medium"),
+                impact_score=edit.get("impact_score")
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to parse cv_edit: {e}. Skipping this edit.")
+            continue
+
+
+def build_cv_json_structure(cv: CV) -> str:
+    """Tóm tắt cấu trúc CV JSON để LLM đề xuất sửa theo field_path"""
+    # Slice mỗi list một lần rồi dùng lại trong template
+    skills_head = cv.skills[:10] if cv.skills else []
+    skills_more = "..." if len(cv.skills) > 10 else ""
+    education_lines = chr(10).join([
+        f'    {{"degree": "{edu.degree}", "institution": "{edu.institution}", "gpa": {edu.gpa or "null"}}}'
+        for edu in cv.education[:3]
+    ])
+    experience_lines = chr(10).join([
+        f'    {{"title": "{exp.title}", "company": "{exp.company}", "duration": "{exp.duration}", "responsibilities": {len(exp.responsibilities)} items, "achievements": {len(exp.achievements or [])} items}}'
+        for exp in cv.experience[:3]
+    ])
+    certifications_head = cv.certifications[:5] if cv.certifications else []
+    languages_head = cv.languages[:5] if cv.languages else []
+    
+    return f"""
+CV JSON Structure:
+{{
+  "name": "{cv.name}",
+  "email": "{cv.email}",
+  "phone": "{cv.phone or 'null'}",
+  "summary": "{(cv.summary or 'null')[:100]}...",
+  "skills": {json_dumps(skills_head)}{skills_more},
+  "education": [
+{education_lines}
+  ],
+  "experience": [
+{experience_lines}
+  ],
+  "certifications": {json_dumps(certifications_head)},
+  "languages": {json_dumps(languages_head)}
+}}
+"""
+
+
 # ============================================================================
 # ROUTE 1: PARSE PDF CV
 # ============================================================================
@@ -437,7 +551,7 @@ JSON:"""
     ]
     
     result_text = call_llm(messages, max_tokens=2000)
-    cv_data_dict = json.loads(result_text)
+    cv_data_dict = json_loads(result_text)
     
     # Convert to CV model
     education_list = [
@@ -713,7 +827,7 @@ Return JSON:
     ]
     
     result = call_llm(messages, max_tokens=1500)
-    return json.loads(result)
+    return json_loads(result)
 
 
 def generate_overall_analysis(cv, method, quality, is_few_shot, count, score, refined):
@@ -774,24 +888,7 @@ async def evaluate_cv(request: EvaluateRequest):
         # Tính điểm tổng hợp (weighted average)
         breakdown = evaluation["breakdown"]
         
-        # Trọng số cho từng tiêu chí
-        weights = {
-            "skills": 0.25,
-            "experience": 0.25,
-            "education": 0.15,
-            "completeness": 0.15,
-            "job_alignment": 0.10,
-            "presentation": 0.10
-        }
-        
-        overall_score = (
-            breakdown["skills_score"] * weights["skills"] +
-            breakdown["experience_score"] * weights["experience"] +
-            breakdown["education_score"] * weights["education"] +
-            breakdown["completeness_score"] * weights["completeness"] +
-            breakdown["job_alignment_score"] * weights["job_alignment"] +
-            breakdown["presentation_score"] * weights["presentation"]
-        )
+        overall_score = weighted_overall_score(breakdown, _EVALUATE_WEIGHTS)
         
         # Xác định grade
         grade = calculate_grade(overall_score)
@@ -799,40 +896,7 @@ async def evaluate_cv(request: EvaluateRequest):
         logger.info(f"✅ Evaluation complete: {overall_score:.1f}/100 (Grade: {grade})")
         
         # Parse cv_edits từ evaluation
-        cv_edits_raw = evaluation.get("cv_edits", [])
-        cv_edits = []
-        for edit in cv_edits_raw:
-            # Xử lý suggested_value: convert sang string nếu là list/dict
-            suggested_val = edit.get("suggested_value", "")
-            if isinstance(suggested_val, (list, dict)):
-                suggested_val = json.dumps(suggested_val, ensure_ascii=False)
-            elif suggested_val is None:
-                suggested_val = ""
-            else:
-                suggested_val = str(suggested_val)
-            
-            # Xử lý current_value tương tự
-            current_val = edit.get("current_value")
-            if isinstance(current_val, (list, dict)):
-                current_val = json.dumps(current_val, ensure_ascii=False)
-            elif current_val is not None:
-                current_val = str(current_val)
-            
-            try:
-                cv_edits.append(
-                    CVEdit(
-                        field_path=edit.get("field_path", ""),
-                        action=edit.get("action", "add"),
-                        current_value=current_val,
-                        suggested_value=suggested_val,
-                        reason=edit.get("reason", ""),
-                        priority=edit.get("priority", "medium"),
-                        impact_score=edit.get("impact_score")
-                    )
-                )
-            except Exception as e:
-                logger.warning(f"⚠️ Failed to parse cv_edit: {e}. Skipping this edit.")
-                continue
+        cv_edits = list(iter_cv_edits(evaluation.get("cv_edits", [])))
         
         logger.info(f"   CV Edits suggested: {len(cv_edits)}")
         
@@ -881,24 +945,7 @@ def evaluate_cv_comprehensive(cv: CV, jobs_list: List[JobDescription]) -> Dict:
     """Đánh giá CV tổng hợp với LLM + đề xuất sửa cụ thể"""
     
     # Chuẩn bị thông tin CV chi tiết cho việc đề xuất sửa
-    cv_json_structure = f"""
-CV JSON Structure:
-{{
-  "name": "{cv.name}",
-  "email": "{cv.email}",
-  "phone": "{cv.phone or 'null'}",
-  "summary": "{(cv.summary or 'null')[:100]}...",
-  "skills": {json.dumps(cv.skills[:10] if cv.skills else [], ensure_ascii=False)}{"..." if len(cv.skills) > 10 else ""},
-  "education": [
-{chr(10).join([f'    {{"degree": "{edu.degree}", "institution": "{edu.institution}", "gpa": {edu.gpa or "null"}}}' for edu in cv.education[:3]])}
-  ],
-  "experience": [
-{chr(10).join([f'    {{"title": "{exp.title}", "company": "{exp.company}", "duration": "{exp.duration}", "responsibilities": {len(exp.responsibilities)} items, "achievements": {len(exp.achievements or [])} items}}' for exp in cv.experience[:3]])}
-  ],
-  "certifications": {json.dumps(cv.certifications[:5] if cv.certifications else [], ensure_ascii=False)},
-  "languages": {json.dumps(cv.languages[:5] if cv.languages else [], ensure_ascii=False)}
-}}
-"""
+    cv_json_structure = build_cv_json_structure(cv)
 
     cv_info = f"""
 CV Information:
@@ -1017,7 +1064,16 @@ IMPORTANT:
     ]
     
     result = call_llm(messages, max_tokens=3000)
-    return json.loads(result)
+    return json_loads(result)
+
+
+def weighted_overall_score(breakdown: Dict, weights: Tuple[float, ...]) -> float:
+    """
+    Tính điểm tổng hợp (weighted average) từ score breakdown.
+    Cộng tuần tự trái → phải như công thức gốc: dot product (NumPy) làm tròn khác,
+    vd. 44.999... thay vì 45.0 và đổi grade.
+    """
+    return sum(breakdown[k] * w for k, w in zip(_SCORE_KEYS, weights))
 
 
 def calculate_grade(score: float) -> str:
@@ -1052,6 +1108,69 @@ def calculate_grade(score: float) -> str:
 # ROUTE 4: EVALUATE CV WITH TARGET JD + SIMILAR JDs
 # ============================================================================
 
+def _skill_gap_analysis(
+    cv: CV,
+    target_jd: JobDescription,
+    similar_jds: List[JobDescription]
+) -> Tuple[Optional[SkillGapInfo], str]:
+    """Skill gap analysis (STEP 1-4) + RAG context (STEP 5-6)"""
+    logger.info("   📌 Running skill gap analysis...")
+    
+    # Collect all JD skills (target + similar)
+    all_jd_skills = list(target_jd.required_skills)
+    for sjd in similar_jds:
+        all_jd_skills.extend(sjd.required_skills)
+    
+    # Calculate skill gap
+    gap_result = calculate_skill_gap(
+        cv_skills=cv.skills,
+        jd_skills=target_jd.required_skills,
+        include_similar_jds_skills=all_jd_skills
+    )
+    
+    logger.info(f"   ✅ Skill gap: {gap_result.match_percentage}% match, {len(gap_result.missing_skills)} missing")
+    
+    # Create skill gap info for response
+    skill_gap_info = SkillGapInfo(
+        match_percentage=gap_result.match_percentage,
+        gap_severity=gap_result.gap_severity,
+        matching_skills=gap_result.matching_skills,
+        missing_skills=gap_result.missing_skills,
+        extra_skills=gap_result.extra_skills[:10],  # Limit to 10
+        high_priority_missing=gap_result.high_priority_missing,
+        quick_wins=gap_result.quick_wins
+    )
+    
+    # ===== STEP 5-6: BUILD RAG CONTEXT =====
+    logger.info("   📚 Building RAG context...")
+    try:
+        rag_context = get_rag_context_for_evaluation(
+            cv_skills=cv.skills,
+            jd_skills=target_jd.required_skills,
+            jd_title=target_jd.title,
+            skill_gap=gap_result,
+            use_embeddings=False  # Start with simple context, set True for full RAG
+        )
+    except Exception as rag_error:
+        logger.warning(f"   ⚠️ RAG context failed: {rag_error}")
+        rag_context = format_skill_gap_for_prompt(gap_result)
+    
+    return skill_gap_info, rag_context
+
+
+def _no_skill_gap_analysis(
+    cv: CV,
+    target_jd: JobDescription,
+    similar_jds: List[JobDescription]
+) -> Tuple[Optional[SkillGapInfo], str]:
+    """Fallback khi skill modules không available"""
+    return None, ""
+
+
+# Resolve một lần lúc import, handler gọi thẳng không cần check SKILL_MODULES_AVAILABLE
+run_skill_gap_analysis = _skill_gap_analysis if SKILL_MODULES_AVAILABLE else _no_skill_gap_analysis
+
+
 @app.post("/evaluate/with-jd", response_model=EvaluateResponse)
 async def evaluate_cv_with_jd(request: EvaluateWithJDRequest):
     """
@@ -1080,51 +1199,8 @@ async def evaluate_cv_with_jd(request: EvaluateWithJDRequest):
         target_jd = request.target_jd
         similar_jds = request.similar_jds or []
         
-        # ===== STEP 1-4: SKILL GAP ANALYSIS =====
-        skill_gap_info = None
-        rag_context = ""
-        
-        if SKILL_MODULES_AVAILABLE:
-            logger.info("   📌 Running skill gap analysis...")
-            
-            # Collect all JD skills (target + similar)
-            all_jd_skills = list(target_jd.required_skills)
-            for sjd in similar_jds:
-                all_jd_skills.extend(sjd.required_skills)
-            
-            # Calculate skill gap
-            gap_result = calculate_skill_gap(
-                cv_skills=cv.skills,
-                jd_skills=target_jd.required_skills,
-                include_similar_jds_skills=all_jd_skills
-            )
-            
-            logger.info(f"   ✅ Skill gap: {gap_result.match_percentage}% match, {len(gap_result.missing_skills)} missing")
-            
-            # Create skill gap info for response
-            skill_gap_info = SkillGapInfo(
-                match_percentage=gap_result.match_percentage,
-                gap_severity=gap_result.gap_severity,
-                matching_skills=gap_result.matching_skills,
-                missing_skills=gap_result.missing_skills,
-                extra_skills=gap_result.extra_skills[:10],  # Limit to 10
-                high_priority_missing=gap_result.high_priority_missing,
-                quick_wins=gap_result.quick_wins
-            )
-            
-            # ===== STEP 5-6: BUILD RAG CONTEXT =====
-            logger.info("   📚 Building RAG context...")
-            try:
-                rag_context = get_rag_context_for_evaluation(
-                    cv_skills=cv.skills,
-                    jd_skills=target_jd.required_skills,
-                    jd_title=target_jd.title,
-                    skill_gap=gap_result,
-                    use_embeddings=False  # Start with simple context, set True for full RAG
-                )
-            except Exception as rag_error:
-                logger.warning(f"   ⚠️ RAG context failed: {rag_error}")
-                rag_context = format_skill_gap_for_prompt(gap_result)
+        # ===== STEP 1-6: SKILL GAP ANALYSIS + RAG CONTEXT =====
+        skill_gap_info, rag_context = run_skill_gap_analysis(cv, target_jd, similar_jds)
         
         # ===== STEP 7: CALL LLM =====
         logger.info("   🤖 Calling LLM for evaluation...")
@@ -1135,62 +1211,14 @@ async def evaluate_cv_with_jd(request: EvaluateWithJDRequest):
         # Tính điểm tổng hợp (weighted average)
         breakdown = evaluation["breakdown"]
         
-        # Trọng số - skill alignment quan trọng hơn khi có explicit gap analysis
-        weights = {
-            "skills": 0.25,
-            "experience": 0.20,
-            "education": 0.10,
-            "completeness": 0.10,
-            "job_alignment": 0.25,
-            "presentation": 0.10
-        }
-        
-        overall_score = (
-            breakdown["skills_score"] * weights["skills"] +
-            breakdown["experience_score"] * weights["experience"] +
-            breakdown["education_score"] * weights["education"] +
-            breakdown["completeness_score"] * weights["completeness"] +
-            breakdown["job_alignment_score"] * weights["job_alignment"] +
-            breakdown["presentation_score"] * weights["presentation"]
-        )
+        overall_score = weighted_overall_score(breakdown, _EVALUATE_WITH_JD_WEIGHTS)
         
         grade = calculate_grade(overall_score)
         
         logger.info(f"✅ Evaluation complete: {overall_score:.1f}/100 (Grade: {grade})")
         
         # ===== STEP 8: POST-PROCESS CV EDITS =====
-        cv_edits_raw = evaluation.get("cv_edits", [])
-        cv_edits = []
-        for edit in cv_edits_raw:
-            suggested_val = edit.get("suggested_value", "")
-            if isinstance(suggested_val, (list, dict)):
-                suggested_val = json.dumps(suggested_val, ensure_ascii=False)
-            elif suggested_val is None:
-                suggested_val = ""
-            else:
-                suggested_val = str(suggested_val)
-            
-            current_val = edit.get("current_value")
-            if isinstance(current_val, (list, dict)):
-                current_val = json.dumps(current_val, ensure_ascii=False)
-            elif current_val is not None:
-                current_val = str(current_val)
-            
-            try:
-                cv_edits.append(
-                    CVEdit(
-                        field_path=edit.get("field_path", ""),
-                        action=edit.get("action", "add"),
-                        current_value=current_val,
-                        suggested_value=suggested_val,
-                        reason=edit.get("reason", ""),
-                        priority=edit.get("priority", "medium"),
-                        impact_score=edit.get("impact_score")
-                    )
-                )
-            except Exception as e:
-                logger.warning(f"⚠️ Failed to parse cv_edit: {e}. Skipping.")
-                continue
+        cv_edits = list(iter_cv_edits(evaluation.get("cv_edits", [])))
         
         logger.info(f"   CV Edits suggested: {len(cv_edits)}")
         
@@ -1217,9 +1245,7 @@ async def evaluate_cv_with_jd(request: EvaluateWithJDRequest):
         )
         
     except Exception as e:
-        logger.error(f"❌ Evaluation error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"❌ Evaluation error: {e}")
         return EvaluateResponse(
             success=False,
             cv_name=request.cv.name,
@@ -1239,81 +1265,45 @@ async def evaluate_cv_with_jd(request: EvaluateWithJDRequest):
         )
 
 
-def evaluate_cv_with_target_jd_enhanced(
-    cv: CV, 
-    target_jd: JobDescription, 
-    similar_jds: List[JobDescription],
-    rag_context: str = ""
-) -> Dict:
+def _jd_cache_key(jd: JobDescription) -> tuple:
+    """Hashable key cho JD: (title, company, required_skills, requirements, responsibilities, preferred)"""
+    return (
+        jd.title,
+        jd.company,
+        tuple(jd.required_skills),
+        tuple(jd.requirements),
+        tuple(jd.responsibilities),
+        tuple(jd.preferred_qualifications or [])
+    )
+
+
+@lru_cache(maxsize=512)
+def build_jd_block(target_key: tuple, similar_keys: tuple) -> str:
     """
-    Đánh giá CV với focus vào target JD, tham khảo similar JDs cho additional skills.
+    Build prompt block cho target JD + similar JDs.
     
-    Enhanced version với RAG context từ skill ontology và knowledge base.
-    
-    - Target JD: Đánh giá chính, skills match, requirements match
-    - Similar JDs: Tham khảo thêm skills tương tự, requirements phổ biến trong ngành
-    - RAG Context: Knowledge từ skill ontology, career paths, resume tips
+    Pure function của dữ liệu JD nên cache lại - batch evaluate nhiều CV
+    với cùng một JD sẽ không phải format lại.
     """
-    
-    # Chuẩn bị thông tin CV chi tiết
-    cv_json_structure = f"""
-CV JSON Structure:
-{{
-  "name": "{cv.name}",
-  "email": "{cv.email}",
-  "phone": "{cv.phone or 'null'}",
-  "summary": "{(cv.summary or 'null')[:100]}...",
-  "skills": {json.dumps(cv.skills[:10] if cv.skills else [], ensure_ascii=False)}{"..." if len(cv.skills) > 10 else ""},
-  "education": [
-{chr(10).join([f'    {{"degree": "{edu.degree}", "institution": "{edu.institution}", "gpa": {edu.gpa or "null"}}}' for edu in cv.education[:3]])}
-  ],
-  "experience": [
-{chr(10).join([f'    {{"title": "{exp.title}", "company": "{exp.company}", "duration": "{exp.duration}", "responsibilities": {len(exp.responsibilities)} items, "achievements": {len(exp.achievements or [])} items}}' for exp in cv.experience[:3]])}
-  ],
-  "certifications": {json.dumps(cv.certifications[:5] if cv.certifications else [], ensure_ascii=False)},
-  "languages": {json.dumps(cv.languages[:5] if cv.languages else [], ensure_ascii=False)}
-}}
-"""
-
-    cv_info = f"""
-CV Information:
-- Name: {cv.name}
-- Email: {cv.email}
-- Phone: {cv.phone or 'Not provided'}
-- Summary: {cv.summary or 'Not provided'}
-- Skills: {', '.join(cv.skills) if cv.skills else 'None listed'}
-- Number of skills: {len(cv.skills)}
-- Education entries: {len(cv.education)}
-- Experience entries: {len(cv.experience)}
-- Certifications: {len(cv.certifications or [])}
-- Languages: {len(cv.languages or [])}
-
-Education Details:
-{chr(10).join([f"  - {edu.degree} at {edu.institution}" + (f" (GPA: {edu.gpa})" if edu.gpa else "") for edu in cv.education]) if cv.education else "  None"}
-
-Experience Details:
-{chr(10).join([f"  - {exp.title} at {exp.company} ({exp.duration})" + (f" - Achievements: {len(exp.achievements or [])} items" if exp.achievements else " - No achievements listed") for exp in cv.experience]) if cv.experience else "  None"}
-
-{cv_json_structure}
-"""
+    title, company, required_skills, requirements, responsibilities, preferred = target_key
     
     # ===== TARGET JD (CHÍNH - CHÚ TRỌNG NHẤT) =====
     target_jd_info = f"""
 ===== TARGET JOB DESCRIPTION (PRIMARY - FOCUS ON THIS) =====
-Title: {target_jd.title}
-Company: {target_jd.company}
+Title: {title}
+Company: {company}
 
 REQUIRED SKILLS (MUST HAVE):
-{chr(10).join([f"  ★ {skill}" for skill in target_jd.required_skills])}
+{chr(10).join([f"  ★ {skill}" for skill in required_skills])}
 
 REQUIREMENTS:
-{chr(10).join([f"  - {req}" for req in target_jd.requirements])}
+{chr(10).join([f"  - {req}" for req in requirements])}
 
 RESPONSIBILITIES:
-{chr(10).join([f"  - {resp}" for resp in target_jd.responsibilities[:5]])}
+{chr(10).join([f"  - {resp}" for resp in responsibilities[:5]])}
 
 PREFERRED QUALIFICATIONS:
-{chr(10).join([f"  - {qual}" for qual in (target_jd.preferred_qualifications or [])[:5]]) or "  None specified"}
+{chr(10).join([f"  - {qual}" for qual in preferred[:5]]) or "  None specified"}
 """
     
     # ===== SIMILAR JDs (THAM KHẢO) =====
@@ -1321,10 +1311,10 @@ PREFERRED QUALIFICATIONS:
     all_similar_skills = []
     all_similar_requirements = []
     
-    if similar_jds:
-        for jd in similar_jds:
-            all_similar_skills.extend(jd.required_skills)
-            all_similar_requirements.extend(jd.requirements[:3])
+    if similar_keys:
+        for _, _, jd_skills, jd_requirements, _, _ in similar_keys:
+            all_similar_skills.extend(jd_skills)
+            all_similar_requirements.extend(jd_requirements[:3])
         
         # Deduplicate
         all_similar_skills = list(set(all_similar_skills))
@@ -1335,8 +1325,8 @@ PREFERRED QUALIFICATIONS:
 These similar JDs provide additional context on common skills and requirements in this field.
 Use these to identify additional valuable skills the candidate might need.
 
-Similar Positions ({len(similar_jds)} jobs):
-{chr(10).join([f"  • {jd.title} at {jd.company} - Skills: {', '.join(jd.required_skills[:5])}" for jd in similar_jds[:5]])}
+Similar Positions ({len(similar_keys)} jobs):
+{chr(10).join([f"  • {jd_title} at {jd_company} - Skills: {', '.join(jd_skills[:5])}" for jd_title, jd_company, jd_skills, _, _, _ in similar_keys[:5]])}
 
 Common Skills across Similar JDs (for reference):
 {', '.join(all_similar_skills[:15])}
@@ -1347,6 +1337,56 @@ Common Requirements across Similar JDs (for reference):
     else:
         similar_jds_info = "\nNo similar JDs provided for reference."
     
+    return f"{target_jd_info}\n\n{similar_jds_info}"
+
+
+def evaluate_cv_with_target_jd_enhanced(
+    cv: CV, 
+    target_jd: JobDescription, 
+    similar_jds: List[JobDescription],
+    rag_context: str = ""
+) -> Dict:
+    """
+    Đánh giá CV với focus vào target JD, tham khảo similar JDs cho additional skills.
+    
+    Enhanced version với RAG context từ skill ontology và knowledge base.
+    
+    - Target JD: Đánh giá chính, skills match, requirements match
+    - Similar JDs: Tham khảo thêm skills tương tự, requirements phổ biến trong ngành
+    - RAG Context: Knowledge từ skill ontology, career paths, resume tips
+    """
+    
+    # Chuẩn bị thông tin CV chi tiết
+    cv_json_structure = build_cv_json_structure(cv)
+
+    cv_info = f"""
+CV Information:
+- Name: {cv.name}
+- Email: {cv.email}
+- Phone: {cv.phone or 'Not provided'}
+- Summary: {cv.summary or 'Not provided'}
+- Skills: {', '.join(cv.skills) if cv.skills else 'None listed'}
+- Number of skills: {len(cv.skills)}
+- Education entries: {len(cv.education)}
+- Experience entries: {len(cv.experience)}
+- Certifications: {len(cv.certifications or [])}
+- Languages: {len(cv.languages or [])}
+
+Education Details:
+{chr(10).join([f"  - {edu.degree} at {edu.institution}" + (f" (GPA: {edu.gpa})" if edu.gpa else "") for edu in cv.education]) if cv.education else "  None"}
+
+Experience Details:
+{chr(10).join([f"  - {exp.title} at {exp.company} ({exp.duration})" + (f" - Achievements: {len(exp.achievements or [])} items" if exp.achievements else " - No achievements listed") for exp in cv.experience]) if cv.experience else "  None"}
+
+{cv_json_structure}
+"""
+    
+    # ===== TARGET JD + SIMILAR JDs (cached theo nội dung JD) =====
+    jd_block = build_jd_block(
+        _jd_cache_key(target_jd),
+        tuple(_jd_cache_key(jd) for jd in similar_jds)
+    )
+    
     # ===== RAG CONTEXT (KNOWLEDGE FROM ONTOLOGY) =====
     rag_section = ""
     if rag_context:
@@ -1359,9 +1399,7 @@ The similar JDs are only for REFERENCE to identify additional relevant skills in
 
 {cv_info}
 
-{target_jd_info}
-
-{similar_jds_info}
+{jd_block}
 {rag_section}
 ===== EVALUATION INSTRUCTIONS =====
 
@@ -1441,7 +1479,7 @@ IMPORTANT:
     ]
     
     result = call_llm(messages, max_tokens=3500)
-    return json.loads(result)
+    return json_loads(result)
 
 
 # ============================================================================
@@ -9,10 +9,28 @@ Module này cung cấp:
 4. Skill metadata (demand, salary, learning path)
 """
 
-from typing import Dict, List, Optional, Set
-from dataclasses import dataclass
+from typing import Callable, Dict, FrozenSet, Iterable, Iterator, List, Optional, Set, Tuple
+from collections import defaultdict
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from itertools import islice
+from sys import intern
 from enum import Enum
 import json
+import logging
+import re
+import threading
+
+import numpy as np
+
+# orjson cho export_ontology_to_json, fallback về stdlib json
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+logger = logging.getLogger(__name__)
 
 
 class SkillCategory(str, Enum):
@@ -44,38 +62,328 @@ class MarketDemand(str, Enum):
     NICHE = "niche"
 
 
-@dataclass
+@dataclass(frozen=True)
 class Skill:
-    """Skill entity in ontology"""
+    """Skill entity in ontology (immutable, không có per-instance __dict__)"""
+    __slots__ = (
+        "id", "name", "category", "aliases", "related_skills", "parent_skills",
+        "child_skills", "description", "learning_path", "best_practices", "cv_tips",
+        "market_demand", "salary_range_vnd", "experience_level", "keywords",
+    )
+    
     id: str
     name: str                           # Canonical name
     category: SkillCategory
-    aliases: List[str]                  # Alternative names
-    related_skills: List[str]           # Related/similar skills
-    parent_skills: List[str]            # Prerequisite skills
-    child_skills: List[str]             # Skills that build on this
+    aliases: Tuple[str, ...]            # Alternative names
+    related_skills: Tuple[str, ...]     # Related/similar skills
+    parent_skills: Tuple[str, ...]      # Prerequisite skills
+    child_skills: Tuple[str, ...]       # Skills that build on this
     description: str
     learning_path: str
-    best_practices: List[str]
+    best_practices: Tuple[str, ...]
     cv_tips: str
     market_demand: MarketDemand
     salary_range_vnd: str               # VND per month
     experience_level: str               # junior/mid/senior required
-    keywords: List[str]                 # Keywords for matching
+    keywords: Tuple[str, ...]           # Keywords for matching
+    
+    # frozen + __slots__ tự viết: không có __dict__ nên pickle / copy cần state tường minh
+    # (giống dataclass(slots=True) trên Python 3.10+)
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+    
+    def __setstate__(self, state):
+        for name, value in zip(self.__slots__, state):
+            object.__setattr__(self, name, value)
 
 
 # ============================================================================
 # SKILL ONTOLOGY DATABASE
 # ============================================================================
 
+# Hai namespace tách biệt: id (strict) và alias (lowercase, không trùng id của chính skill)
+SKILL_BY_ID: Dict[str, Skill] = {}
+SKILL_BY_ALIAS: Dict[str, Skill] = {}
+
+# Tương thích ngược: id + alias → skill theo thứ tự đăng ký như trước (id ưu tiên hơn alias)
 SKILL_ONTOLOGY: Dict[str, Skill] = {}
 
+# Char trie của mọi term (name, aliases, keywords) → skill ids, dùng để scan
+# text một lượt thay vì search từng term. Node: {char: child_node, _TRIE_END: tuple ids}
+_ALIAS_TRIE: Dict[str, dict] = {}
+_TRIE_END = ""
+
+# Dense int index cho mỗi skill, cấp lúc _register_skill
+_ID_TO_IDX: Dict[str, int] = {}
+_IDX_TO_SKILL: List[Skill] = []
+
+# Integer tag cho enum, để filter trong vòng lặp nóng so sánh int thay vì enum
+_CATEGORY_INT: Dict[SkillCategory, int] = {cat: i for i, cat in enumerate(SkillCategory)}
+_DEMAND_INT: Dict[MarketDemand, int] = {d: i for i, d in enumerate(MarketDemand)}
+_CATEGORY_VALUES: Tuple[str, ...] = tuple(cat.value for cat in SkillCategory)
+_CATEGORY_TAG_BY_VALUE: Dict[str, int] = {cat.value: i for i, cat in enumerate(SkillCategory)}
+
+# Category / demand tag theo skill index, build trong _finalize_ontology()
+_CATEGORY_BY_IDX = np.zeros(0, dtype=np.int8)
+_DEMAND_BY_IDX = np.zeros(0, dtype=np.int8)
+
+# Đồ thị parent → child dạng CSR: children của skill i là
+# _CHILD_INDICES[_CHILD_INDPTR[i]:_CHILD_INDPTR[i + 1]]
+_CHILD_INDPTR = np.zeros(1, dtype=np.int32)
+_CHILD_INDICES = np.zeros(0, dtype=np.int32)
+
+# Regex cho mỗi skill (name + aliases + keywords), cùng word boundary với scan.
+# Compile ở lần dùng đầu qua _skill_term_re()
+_SKILL_TERM_RE: Dict[str, re.Pattern] = {}
+_BOUNDARY_BEFORE = r"(?<![^\s,;()\[\]{}])"
+_BOUNDARY_AFTER = r"(?![^\s,;()\[\]{}])"
+
+# Normalized alias → skill id, cho lookup không phân biệt "react.js" / "reactjs" / "react js"
+_NORM_ALIAS: Dict[str, str] = {}
+_NORM_STRIP_RE = re.compile(r"[\s.\-_]+")
+
+# Lowercase id / alias / name / keyword → skill, build trong _finalize_ontology().
+# Thứ tự ưu tiên giống get_skill: id, alias, rồi name/alias/keyword của skill đăng ký trước
+_TERM_INDEX: Dict[str, Skill] = {}
+
+# related_skills / parent_skills lowercase theo skill id, build trong _finalize_ontology()
+_RELATED_LOWER: Dict[str, FrozenSet[str]] = {}
+_PARENT_LOWER: Dict[str, FrozenSet[str]] = {}
+
+# Tuple skills không trùng lặp theo thứ tự đăng ký, build trong _finalize_ontology()
+_UNIQUE_SKILLS: Tuple[Skill, ...] = ()
+
+# Name + aliases + keywords lowercase của mỗi skill (cùng thứ tự _UNIQUE_SKILLS) nối
+# bằng _SEARCH_SEP, để search_skills test substring một lần / skill
+_SEARCH_TEXT: Tuple[str, ...] = ()
+_SEARCH_SEP = "\x00"
+
+# Index skill theo category / market demand, build trong _finalize_ontology()
+_BY_CATEGORY: Dict[SkillCategory, Tuple[Skill, ...]] = {}
+_BY_DEMAND: Dict[MarketDemand, Tuple[Skill, ...]] = {}
+
+# Ký tự phân cách term trong text (ngoài whitespace)
+_TERM_DELIMITERS = frozenset(",;()[]{}")
+
+# Regex tìm vị trí có thể bắt đầu một term: sau delimiter (hoặc đầu text) và là
+# ký tự đầu của ít nhất một term. Build trong _finalize_ontology()
+_TERM_START_RE: Optional[re.Pattern] = None
+
+
+# Kết quả export_ontology_to_json, reset khi có skill mới được đăng ký
+_ONTOLOGY_JSON_CACHE: Optional[str] = None
+
+# True khi có skill đăng ký sau lần _finalize_ontology() gần nhất; các query function
+# build lại index (lazy) ở lần gọi kế tiếp
+_ONTOLOGY_DIRTY = False
+_FINALIZE_LOCK = threading.Lock()
+
+# Callbacks gọi mỗi khi ontology thay đổi (vd. cache_clear của các lru_cache phụ thuộc ontology)
+_ON_CHANGE_CALLBACKS: List[Callable[[], None]] = []
+
+
+# Bảng string dùng chung cho các field dạng list của Skill
+_INTERN: Dict[str, str] = {}
+_T = _INTERN.setdefault
+
+# Pool tuple: các list giống hệt nhau giữa skills dùng chung một tuple object
+_TUPLE_POOL: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+
+
+def _intern_strings(values: Tuple[str, ...]) -> Tuple[str, ...]:
+    """Map mỗi string về bản canonical trong _INTERN, tuple về bản trong _TUPLE_POOL"""
+    pooled = tuple(_T(v, intern(v)) for v in values)
+    return _TUPLE_POOL.setdefault(pooled, pooled)
+
+
 def _register_skill(skill: Skill):
     """Register a skill in the ontology"""
+    global _ONTOLOGY_JSON_CACHE, _ONTOLOGY_DIRTY
+    
+    # Đăng ký lại đúng skill đã có (hot reload, gọi lặp) → no-op
+    if skill.id in _ID_TO_IDX and _IDX_TO_SKILL[_ID_TO_IDX[skill.id]] == skill:
+        return
+    
+    _ONTOLOGY_JSON_CACHE = None
+    _ONTOLOGY_DIRTY = True
+    # Các token trùng giữa skills ("typescript", "docker", "sql", ...) dùng chung một object
+    skill = replace(
+        skill,
+        id=intern(skill.id),
+        name=intern(skill.name),
+        aliases=_intern_strings(skill.aliases),
+        related_skills=_intern_strings(skill.related_skills),
+        parent_skills=_intern_strings(skill.parent_skills),
+        child_skills=_intern_strings(skill.child_skills),
+        best_practices=_intern_strings(skill.best_practices),
+        keywords=_intern_strings(skill.keywords),
+        experience_level=_T(skill.experience_level, intern(skill.experience_level)),
+        salary_range_vnd=_T(skill.salary_range_vnd, intern(skill.salary_range_vnd))
+    )
+    SKILL_BY_ID[skill.id] = skill
+    if skill.id in _ID_TO_IDX:
+        # Thay skill cùng id: build lại alias / term index để bỏ terms của bản cũ
+        _IDX_TO_SKILL[_ID_TO_IDX[skill.id]] = skill
+        SKILL_BY_ALIAS.clear()
+        SKILL_ONTOLOGY.clear()
+        _ALIAS_TRIE.clear()
+        _NORM_ALIAS.clear()
+        for registered in _IDX_TO_SKILL:
+            _index_skill_terms(registered, warn=False)
+    else:
+        _ID_TO_IDX[skill.id] = len(_IDX_TO_SKILL)
+        _IDX_TO_SKILL.append(skill)
+        _index_skill_terms(skill)
+    
+    # Pattern compile lazily ở lần dùng đầu, bỏ bản cũ nếu skill được đăng ký lại
+    _SKILL_TERM_RE.pop(skill.id, None)
+    
+    for callback in _ON_CHANGE_CALLBACKS:
+        callback()
+
+
+def _index_skill_terms(skill: Skill, warn: bool = True):
+    """Thêm id / aliases / terms của skill vào SKILL_BY_ALIAS, SKILL_ONTOLOGY, _ALIAS_TRIE, _NORM_ALIAS"""
     SKILL_ONTOLOGY[skill.id] = skill
-    # Also register aliases for lookup
+    # Also register aliases for lookup; alias đã thuộc skill khác thì giữ skill cũ
     for alias in skill.aliases:
-        SKILL_ONTOLOGY[alias.lower()] = skill
+        key = alias.lower()
+        if key == skill.id:
+            continue
+        owner = SKILL_BY_ALIAS.get(key)
+        if owner is None or owner.id == skill.id:
+            SKILL_BY_ALIAS[key] = skill
+            if key not in SKILL_BY_ID:
+                SKILL_ONTOLOGY[key] = skill
+        elif warn:
+            logger.warning(
+                "Alias '%s' của skill '%s' đã thuộc skill '%s', bỏ qua",
+                key, skill.id, owner.id
+            )
+    
+    for term in (skill.name, *skill.aliases, *skill.keywords):
+        _trie_insert(term.lower(), skill.id)
+    
+    for name in (skill.id, skill.name, *skill.aliases):
+        _NORM_ALIAS.setdefault(_normalize_token(name), skill.id)
+
+
+def on_ontology_change(callback: Callable[[], None]) -> Callable[[], None]:
+    """
+    Đăng ký callback gọi mỗi khi có skill mới / thay đổi được đăng ký
+    (vd. cache_clear của lru_cache dựa trên kết quả ontology).
+    """
+    _ON_CHANGE_CALLBACKS.append(callback)
+    return callback
+
+
+def _refinalize():
+    """Build lại index nếu có skill đăng ký sau _finalize_ontology() (một thread build)"""
+    with _FINALIZE_LOCK:
+        if _ONTOLOGY_DIRTY:
+            _finalize_ontology()
+
+
+def _skill_term_re(skill: Skill) -> re.Pattern:
+    """Regex (name + aliases + keywords) của skill, compile một lần rồi cache"""
+    pattern = _SKILL_TERM_RE.get(skill.id)
+    if pattern is None:
+        # Term dài trước để alternation không dừng ở prefix ngắn hơn
+        terms = sorted(
+            {t.lower() for t in (skill.name, *skill.aliases, *skill.keywords)},
+            key=len,
+            reverse=True
+        )
+        pattern = re.compile(
+            _BOUNDARY_BEFORE + "(?:" + "|".join(map(re.escape, terms)) + ")" + _BOUNDARY_AFTER,
+            re.IGNORECASE
+        )
+        _SKILL_TERM_RE[skill.id] = pattern
+    return pattern
+
+
+def _normalize_token(token: str) -> str:
+    """Lowercase và bỏ whitespace/./-/_ để so khớp các biến thể tên"""
+    return _NORM_STRIP_RE.sub("", token.lower())
+
+
+def _lookup_id_or_alias(key: str) -> Optional[Skill]:
+    """Tìm theo id trước, alias sau (key đã lowercase)"""
+    skill = SKILL_BY_ID.get(key)
+    if skill is None:
+        skill = SKILL_BY_ALIAS.get(key)
+    return skill
+
+
+def _trie_insert(term: str, skill_id: str):
+    """Insert term vào _ALIAS_TRIE"""
+    if not term:
+        return
+    node = _ALIAS_TRIE
+    for char in term:
+        node = node.setdefault(char, {})
+    # Ids lưu dạng tuple ngay từ đầu (scan yield thẳng ra ngoài), thêm id = tạo tuple mới
+    ids = node.get(_TRIE_END, ())
+    if skill_id not in ids:
+        node[_TRIE_END] = (*ids, skill_id)
+
+
+def _finalize_ontology():
+    """
+    Chạy sau lần _register_skill cuối cùng; skill đăng ký sau đó đánh dấu
+    _ONTOLOGY_DIRTY và index được build lại qua _refinalize().
+    Compile _TERM_START_RE,
+    build CSR graph, category / demand tags, _UNIQUE_SKILLS, _SEARCH_TEXT, _TERM_INDEX,
+    related / parent lowercase sets và các index category / market demand.
+    """
+    global _TERM_START_RE, _CHILD_INDPTR, _CHILD_INDICES, _CATEGORY_BY_IDX, _DEMAND_BY_IDX
+    global _UNIQUE_SKILLS, _SEARCH_TEXT, _ONTOLOGY_DIRTY
+    
+    _UNIQUE_SKILLS = tuple(_IDX_TO_SKILL)
+    _SEARCH_TEXT = tuple(
+        _SEARCH_SEP.join(t.lower() for t in (skill.name, *skill.aliases, *skill.keywords))
+        for skill in _UNIQUE_SKILLS
+    )
+    _CHILD_INDPTR, _CHILD_INDICES = _build_child_csr()
+    _CATEGORY_BY_IDX = np.array(
+        [_CATEGORY_INT[skill.category] for skill in _IDX_TO_SKILL], dtype=np.int8
+    )
+    _DEMAND_BY_IDX = np.array(
+        [_DEMAND_INT[skill.market_demand] for skill in _IDX_TO_SKILL], dtype=np.int8
+    )
+    
+    _RELATED_LOWER.clear()
+    _RELATED_LOWER.update(
+        (skill.id, frozenset(s.lower() for s in skill.related_skills)) for skill in _UNIQUE_SKILLS
+    )
+    _PARENT_LOWER.clear()
+    _PARENT_LOWER.update(
+        (skill.id, frozenset(s.lower() for s in skill.parent_skills)) for skill in _UNIQUE_SKILLS
+    )
+    
+    by_category: Dict[SkillCategory, List[Skill]] = defaultdict(list)
+    by_demand: Dict[MarketDemand, List[Skill]] = defaultdict(list)
+    for skill in _UNIQUE_SKILLS:
+        by_category[skill.category].append(skill)
+        by_demand[skill.market_demand].append(skill)
+    _BY_CATEGORY.clear()
+    _BY_CATEGORY.update((cat, tuple(skills)) for cat, skills in by_category.items())
+    _BY_DEMAND.clear()
+    _BY_DEMAND.update((demand, tuple(skills)) for demand, skills in by_demand.items())
+    
+    term_index: Dict[str, Skill] = {}
+    for skill in _IDX_TO_SKILL:
+        for term in (skill.name, *skill.aliases, *skill.keywords):
+            term_index.setdefault(term.lower(), skill)
+    term_index.update(SKILL_BY_ALIAS)
+    term_index.update(SKILL_BY_ID)
+    _TERM_INDEX.clear()
+    _TERM_INDEX.update(term_index)
+    
+    first_chars = "".join(sorted(c for c in _ALIAS_TRIE if c != _TRIE_END))
+    _TERM_START_RE = re.compile(r"(?<![^\s,;()\[\]{}])[" + re.escape(first_chars) + "]")
+    
+    _ONTOLOGY_DIRTY = False
 
 
 # ===== PROGRAMMING LANGUAGES =====
@@ -84,161 +392,161 @@ _register_skill(Skill(
     id="python",
     name="Python",
     category=SkillCategory.PROGRAMMING_LANGUAGE,
-    aliases=["python3", "py", "python 3", "python3.x"],
-    related_skills=["django", "flask", "fastapi", "numpy", "pandas"],
-    parent_skills=[],
-    child_skills=["django", "flask", "fastapi", "data-science", "machine-learning"],
+    aliases=("python3", "py", "python 3", "python3.x"),
+    related_skills=("django", "flask", "fastapi", "numpy", "pandas"),
+    parent_skills=(),
+    child_skills=("django", "flask", "fastapi", "data-science", "machine-learning"),
     description="Ngôn ngữ lập trình đa năng, phổ biến trong web, data science, AI/ML, automation.",
     learning_path="Python basics → OOP → Web framework (Django/Flask) → Testing → Async programming",
-    best_practices=[
+    best_practices=(
         "Sử dụng virtual environment (venv/conda)",
         "Follow PEP 8 style guide",
         "Viết unit tests với pytest",
         "Sử dụng type hints cho code rõ ràng"
-    ],
+    ),
     cv_tips="Liệt kê cụ thể frameworks (Django, FastAPI), không chỉ ghi 'Python'",
     market_demand=MarketDemand.HIGH,
     salary_range_vnd="15-50 triệu",
     experience_level="all",
-    keywords=["python", "django", "flask", "fastapi", "pip", "pytest"]
+    keywords=("python", "django", "flask", "fastapi", "pip", "pytest")
 ))
 
 _register_skill(Skill(
     id="javascript",
     name="JavaScript",
     category=SkillCategory.PROGRAMMING_LANGUAGE,
-    aliases=["js", "es6", "es2015", "ecmascript", "vanilla js", "vanilla javascript"],
-    related_skills=["typescript", "react", "vue", "angular", "nodejs"],
-    parent_skills=[],
-    child_skills=["typescript", "react", "vue", "angular", "nodejs"],
+    aliases=("js", "es6", "es2015", "ecmascript", "vanilla js", "vanilla javascript"),
+    related_skills=("typescript", "react", "vue", "angular", "nodejs"),
+    parent_skills=(),
+    child_skills=("typescript", "react", "vue", "angular", "nodejs"),
     description="Ngôn ngữ lập trình cho web, chạy cả frontend và backend (Node.js).",
     learning_path="JS basics → DOM → Framework (React/Vue) → Node.js → TypeScript",
-    best_practices=[
+    best_practices=(
         "Sử dụng TypeScript cho dự án lớn",
         "Dùng async/await thay callback",
         "Sử dụng ESLint và Prettier",
         "Viết code theo functional style"
-    ],
+    ),
     cv_tips="Ghi 'JavaScript (ES6+)' và frameworks cụ thể",
     market_demand=MarketDemand.VERY_HIGH,
     salary_range_vnd="12-45 triệu",
     experience_level="all",
-    keywords=["javascript", "js", "es6", "node", "npm", "react", "vue"]
+    keywords=("javascript", "js", "es6", "node", "npm", "react", "vue")
 ))
 
 _register_skill(Skill(
     id="typescript",
     name="TypeScript",
     category=SkillCategory.PROGRAMMING_LANGUAGE,
-    aliases=["ts", "type script"],
-    related_skills=["javascript", "react", "angular", "nodejs", "nestjs"],
-    parent_skills=["javascript"],
-    child_skills=["nestjs", "angular"],
+    aliases=("ts", "type script"),
+    related_skills=("javascript", "react", "angular", "nodejs", "nestjs"),
+    parent_skills=("javascript",),
+    child_skills=("nestjs", "angular"),
     description="JavaScript với static typing, giúp code an toàn và maintainable hơn.",
     learning_path="JavaScript proficiency → TS basics → Advanced types → Generics",
-    best_practices=[
+    best_practices=(
         "Sử dụng strict mode",
         "Define proper interfaces",
         "Avoid 'any' type",
         "Use utility types"
-    ],
+    ),
     cv_tips="TypeScript gần như bắt buộc cho Senior frontend roles",
     market_demand=MarketDemand.VERY_HIGH,
     salary_range_vnd="15-50 triệu",
     experience_level="mid",
-    keywords=["typescript", "ts", "tsc", "types", "interfaces"]
+    keywords=("typescript", "ts", "tsc", "types", "interfaces")
 ))
 
 _register_skill(Skill(
     id="go",
     name="Go",
     category=SkillCategory.PROGRAMMING_LANGUAGE,
-    aliases=["golang", "go-lang", "go lang"],
-    related_skills=["docker", "kubernetes", "microservices", "grpc"],
-    parent_skills=[],
-    child_skills=["microservices", "grpc"],
+    aliases=("golang", "go-lang", "go lang"),
+    related_skills=("docker", "kubernetes", "microservices", "grpc"),
+    parent_skills=(),
+    child_skills=("microservices", "grpc"),
     description="Ngôn ngữ của Google, nổi bật về performance và concurrency.",
     learning_path="Go basics → Goroutines & Channels → Web (Gin/Echo) → gRPC → Cloud",
-    best_practices=[
+    best_practices=(
         "Sử dụng go modules",
         "Viết concurrent code với goroutines",
         "Follow effective go guidelines",
         "Sử dụng interfaces"
-    ],
+    ),
     cv_tips="Go developers rất hot, highlight microservices và cloud experience",
     market_demand=MarketDemand.HIGH,
     salary_range_vnd="20-60 triệu",
     experience_level="mid",
-    keywords=["go", "golang", "goroutine", "channel", "gin", "echo"]
+    keywords=("go", "golang", "goroutine", "channel", "gin", "echo")
 ))
 
 _register_skill(Skill(
     id="java",
     name="Java",
     category=SkillCategory.PROGRAMMING_LANGUAGE,
-    aliases=["java8", "java11", "java17", "java21", "jdk", "jre"],
-    related_skills=["spring-boot", "hibernate", "maven", "gradle"],
-    parent_skills=[],
-    child_skills=["spring-boot", "hibernate"],
+    aliases=("java8", "java11", "java17", "java21", "jdk", "jre"),
+    related_skills=("spring-boot", "hibernate", "maven", "gradle"),
+    parent_skills=(),
+    child_skills=("spring-boot", "hibernate"),
     description="Ngôn ngữ enterprise, mạnh về OOP, phổ biến trong banking, fintech.",
     learning_path="Java Core → OOP → Spring Boot → JPA/Hibernate → Microservices",
-    best_practices=[
+    best_practices=(
         "Sử dụng Java 11+ (LTS)",
         "Follow SOLID principles",
         "Sử dụng Spring Boot",
         "Viết clean code"
-    ],
+    ),
     cv_tips="Ghi rõ version (Java 11/17) và Spring Boot experience",
     market_demand=MarketDemand.HIGH,
     salary_range_vnd="15-55 triệu",
     experience_level="all",
-    keywords=["java", "spring", "maven", "gradle", "jvm", "hibernate"]
+    keywords=("java", "spring", "maven", "gradle", "jvm", "hibernate")
 ))
 
 _register_skill(Skill(
     id="csharp",
     name="C#",
     category=SkillCategory.PROGRAMMING_LANGUAGE,
-    aliases=["c-sharp", "c sharp", "csharp", ".net", "dotnet"],
-    related_skills=["asp.net", "entity-framework", "azure"],
-    parent_skills=[],
-    child_skills=["asp.net", "unity"],
+    aliases=("c-sharp", "c sharp", "csharp", ".net", "dotnet"),
+    related_skills=("asp.net", "entity-framework", "azure"),
+    parent_skills=(),
+    child_skills=("asp.net", "unity"),
     description="Ngôn ngữ của Microsoft, dùng cho enterprise apps, game development (Unity).",
     learning_path="C# basics → OOP → ASP.NET Core → Entity Framework → Azure",
-    best_practices=[
+    best_practices=(
         "Sử dụng .NET 6+ (LTS)",
         "Follow C# coding conventions",
         "Use async/await properly",
         "Implement dependency injection"
-    ],
+    ),
     cv_tips="Ghi rõ .NET version và cloud experience (Azure)",
     market_demand=MarketDemand.HIGH,
     salary_range_vnd="15-50 triệu",
     experience_level="all",
-    keywords=["c#", "csharp", ".net", "dotnet", "asp.net", "azure"]
+    keywords=("c#", "csharp", ".net", "dotnet", "asp.net", "azure")
 ))
 
 _register_skill(Skill(
     id="rust",
     name="Rust",
     category=SkillCategory.PROGRAMMING_LANGUAGE,
-    aliases=["rust-lang", "rustlang"],
-    related_skills=["systems-programming", "webassembly"],
-    parent_skills=["c", "cpp"],
-    child_skills=["webassembly"],
+    aliases=("rust-lang", "rustlang"),
+    related_skills=("systems-programming", "webassembly"),
+    parent_skills=("c", "cpp"),
+    child_skills=("webassembly",),
     description="Systems programming language với memory safety, performance cao.",
     learning_path="Rust basics → Ownership & Borrowing → Async → Web frameworks",
-    best_practices=[
+    best_practices=(
         "Embrace the borrow checker",
         "Use cargo properly",
         "Write idiomatic Rust",
         "Leverage the type system"
-    ],
+    ),
     cv_tips="Rust developers rất khan hiếm và được trả lương cao",
     market_demand=MarketDemand.NICHE,
     salary_range_vnd="25-70 triệu",
     experience_level="mid",
-    keywords=["rust", "cargo", "ownership", "borrowing"]
+    keywords=("rust", "cargo", "ownership", "borrowing")
 ))
 
 # ===== FRONTEND FRAMEWORKS =====
@@ -247,115 +555,115 @@ _register_skill(Skill(
     id="react",
     name="React",
     category=SkillCategory.FRONTEND_FRAMEWORK,
-    aliases=["reactjs", "react.js", "react 18", "react js"],
-    related_skills=["redux", "react-query", "nextjs", "typescript"],
-    parent_skills=["javascript", "html", "css"],
-    child_skills=["nextjs", "react-native"],
+    aliases=("reactjs", "react.js", "react 18", "react js"),
+    related_skills=("redux", "react-query", "nextjs", "typescript"),
+    parent_skills=("javascript", "html", "css"),
+    child_skills=("nextjs", "react-native"),
     description="Library JavaScript phổ biến nhất cho frontend, bởi Facebook/Meta.",
     learning_path="React basics → Hooks → State management → Next.js → Testing",
-    best_practices=[
+    best_practices=(
         "Sử dụng functional components và hooks",
         "Tránh prop drilling",
         "Optimize với React.memo, useMemo",
         "Viết tests với React Testing Library"
-    ],
+    ),
     cv_tips="Ghi 'React (Hooks, Redux)' thay vì chỉ 'React'",
     market_demand=MarketDemand.VERY_HIGH,
     salary_range_vnd="15-50 triệu",
     experience_level="all",
-    keywords=["react", "jsx", "hooks", "redux", "component"]
+    keywords=("react", "jsx", "hooks", "redux", "component")
 ))
 
 _register_skill(Skill(
     id="vue",
     name="Vue.js",
     category=SkillCategory.FRONTEND_FRAMEWORK,
-    aliases=["vuejs", "vue", "vue3", "vue 3", "vue.js 3"],
-    related_skills=["vuex", "pinia", "nuxtjs", "typescript"],
-    parent_skills=["javascript", "html", "css"],
-    child_skills=["nuxtjs"],
+    aliases=("vuejs", "vue", "vue3", "vue 3", "vue.js 3"),
+    related_skills=("vuex", "pinia", "nuxtjs", "typescript"),
+    parent_skills=("javascript", "html", "css"),
+    child_skills=("nuxtjs",),
     description="Framework JavaScript progressive, dễ học, phổ biến ở châu Á.",
     learning_path="Vue basics → Composition API → Pinia → Nuxt.js → Testing",
-    best_practices=[
+    best_practices=(
         "Sử dụng Composition API (Vue 3)",
         "Dùng Pinia thay Vuex",
         "Follow Vue style guide",
         "Sử dụng TypeScript"
-    ],
+    ),
     cv_tips="Ghi rõ Vue 2/3, Composition API hay Options API",
     market_demand=MarketDemand.HIGH,
     salary_range_vnd="12-40 triệu",
     experience_level="all",
-    keywords=["vue", "vuex", "pinia", "composition api", "nuxt"]
+    keywords=("vue", "vuex", "pinia", "composition api", "nuxt")
 ))
 
 _register_skill(Skill(
     id="angular",
     name="Angular",
     category=SkillCategory.FRONTEND_FRAMEWORK,
-    aliases=["angular2", "angular 2+", "angularjs"],
-    related_skills=["typescript", "rxjs", "ngrx"],
-    parent_skills=["typescript", "html", "css"],
-    child_skills=[],
+    aliases=("angular2", "angular 2+", "angularjs"),
+    related_skills=("typescript", "rxjs", "ngrx"),
+    parent_skills=("typescript", "html", "css"),
+    child_skills=(),
     description="Framework đầy đủ của Google, mạnh về enterprise applications.",
     learning_path="TypeScript → Angular basics → RxJS → NgRx → Testing",
-    best_practices=[
+    best_practices=(
         "Follow Angular style guide",
         "Use lazy loading",
         "Implement proper state management",
         "Write tests với Jasmine/Karma"
-    ],
+    ),
     cv_tips="Angular phổ biến trong enterprise, ghi rõ version",
     market_demand=MarketDemand.MEDIUM,
     salary_range_vnd="15-45 triệu",
     experience_level="mid",
-    keywords=["angular", "typescript", "rxjs", "ngrx", "module"]
+    keywords=("angular", "typescript", "rxjs", "ngrx", "module")
 ))
 
 _register_skill(Skill(
     id="nextjs",
     name="Next.js",
     category=SkillCategory.FRONTEND_FRAMEWORK,
-    aliases=["next.js", "next js", "next 13", "next 14"],
-    related_skills=["react", "typescript", "vercel"],
-    parent_skills=["react"],
-    child_skills=[],
+    aliases=("next.js", "next js", "next 13", "next 14"),
+    related_skills=("react", "typescript", "vercel"),
+    parent_skills=("react",),
+    child_skills=(),
     description="React framework với SSR, SSG, routing tích hợp.",
     learning_path="React proficiency → Next.js basics → App Router → API Routes → Deployment",
-    best_practices=[
+    best_practices=(
         "Sử dụng App Router (Next 13+)",
         "Optimize images với next/image",
         "Implement ISR for dynamic content",
         "Use Server Components"
-    ],
+    ),
     cv_tips="Next.js rất hot hiện nay, nên highlight trong CV",
     market_demand=MarketDemand.VERY_HIGH,
     salary_range_vnd="18-55 triệu",
     experience_level="mid",
-    keywords=["next", "nextjs", "ssr", "ssg", "vercel", "app router"]
+    keywords=("next", "nextjs", "ssr", "ssg", "vercel", "app router")
 ))
 
 _register_skill(Skill(
     id="tailwindcss",
     name="Tailwind CSS",
     category=SkillCategory.FRONTEND_FRAMEWORK,
-    aliases=["tailwind", "tailwind css"],
-    related_skills=["css", "html", "react", "vue"],
-    parent_skills=["css", "html"],
-    child_skills=[],
+    aliases=("tailwind", "tailwind css"),
+    related_skills=("css", "html", "react", "vue"),
+    parent_skills=("css", "html"),
+    child_skills=(),
     description="Utility-first CSS framework, rất phổ biến hiện nay.",
     learning_path="CSS basics → Tailwind classes → Responsive design → Custom config",
-    best_practices=[
+    best_practices=(
         "Sử dụng @apply cho reusable styles",
         "Custom config cho design system",
         "Use JIT mode",
         "Combine với component libraries"
-    ],
+    ),
     cv_tips="Tailwind được yêu cầu nhiều, nên có trong tech stack",
     market_demand=MarketDemand.HIGH,
     salary_range_vnd="Đi kèm Frontend role",
     experience_level="all",
-    keywords=["tailwind", "utility-first", "css", "responsive"]
+    keywords=("tailwind", "utility-first", "css", "responsive")
 ))
 
 # ===== BACKEND FRAMEWORKS =====
@@ -364,138 +672,138 @@ _register_skill(Skill(
     id="nodejs",
     name="Node.js",
     category=SkillCategory.BACKEND_FRAMEWORK,
-    aliases=["node", "node.js", "nodejs", "node js"],
-    related_skills=["express", "nestjs", "typescript", "mongodb"],
-    parent_skills=["javascript"],
-    child_skills=["express", "nestjs", "fastify"],
+    aliases=("node", "node.js", "nodejs", "node js"),
+    related_skills=("express", "nestjs", "typescript", "mongodb"),
+    parent_skills=("javascript",),
+    child_skills=("express", "nestjs", "fastify"),
     description="JavaScript runtime cho backend, non-blocking I/O, real-time apps.",
     learning_path="Node basics → Express/NestJS → Database → Authentication → Testing",
-    best_practices=[
+    best_practices=(
         "Sử dụng TypeScript",
         "Implement error handling middleware",
         "Sử dụng environment variables",
         "Follow 12-factor app"
-    ],
+    ),
     cv_tips="Ghi cụ thể framework (Express, NestJS) và databases",
     market_demand=MarketDemand.HIGH,
     salary_range_vnd="15-45 triệu",
     experience_level="all",
-    keywords=["node", "npm", "express", "nestjs", "fastify"]
+    keywords=("node", "npm", "express", "nestjs", "fastify")
 ))
 
 _register_skill(Skill(
     id="express",
     name="Express.js",
     category=SkillCategory.BACKEND_FRAMEWORK,
-    aliases=["expressjs", "express.js", "express js"],
-    related_skills=["nodejs", "mongodb", "postgresql"],
-    parent_skills=["nodejs"],
-    child_skills=[],
+    aliases=("expressjs", "express.js", "express js"),
+    related_skills=("nodejs", "mongodb", "postgresql"),
+    parent_skills=("nodejs",),
+    child_skills=(),
     description="Minimal Node.js web framework, phổ biến nhất cho Node backend.",
     learning_path="Node.js basics → Express routing → Middleware → Authentication",
-    best_practices=[
+    best_practices=(
         "Use middleware properly",
         "Implement error handling",
         "Structure project properly",
         "Use helmet for security"
-    ],
+    ),
     cv_tips="Express là baseline, nên có thêm NestJS để nổi bật",
     market_demand=MarketDemand.HIGH,
     salary_range_vnd="Đi kèm Node.js role",
     experience_level="all",
-    keywords=["express", "middleware", "routing", "rest api"]
+    keywords=("express", "middleware", "routing", "rest api")
 ))
 
 _register_skill(Skill(
     id="nestjs",
     name="NestJS",
     category=SkillCategory.BACKEND_FRAMEWORK,
-    aliases=["nest.js", "nest js", "nest"],
-    related_skills=["typescript", "nodejs", "graphql"],
-    parent_skills=["nodejs", "typescript"],
-    child_skills=[],
+    aliases=("nest.js", "nest js", "nest"),
+    related_skills=("typescript", "nodejs", "graphql"),
+    parent_skills=("nodejs", "typescript"),
+    child_skills=(),
     description="Enterprise Node.js framework với TypeScript, inspired by Angular.",
     learning_path="TypeScript → NestJS basics → Modules → Guards/Pipes → Testing",
-    best_practices=[
+    best_practices=(
         "Follow modular architecture",
         "Use dependency injection",
         "Implement proper validation",
         "Write comprehensive tests"
-    ],
+    ),
     cv_tips="NestJS được ưa chuộng hơn Express cho Senior roles",
     market_demand=MarketDemand.HIGH,
     salary_range_vnd="20-50 triệu",
     experience_level="mid",
-    keywords=["nestjs", "decorator", "module", "controller", "service"]
+    keywords=("nestjs", "decorator", "module", "controller", "service")
 ))
 
 _register_skill(Skill(
     id="django",
     name="Django",
     category=SkillCategory.BACKEND_FRAMEWORK,
-    aliases=["django-rest-framework", "drf", "django rest"],
-    related_skills=["python", "postgresql", "celery", "redis"],
-    parent_skills=["python"],
-    child_skills=["django-rest-framework"],
+    aliases=("django-rest-framework", "drf", "django rest"),
+    related_skills=("python", "postgresql", "celery", "redis"),
+    parent_skills=("python",),
+    child_skills=("django-rest-framework",),
     description="Python web framework 'batteries-included', rapid development và security.",
     learning_path="Django basics → Models & ORM → REST API (DRF) → Celery → Deploy",
-    best_practices=[
+    best_practices=(
         "Sử dụng Django REST Framework",
         "Implement JWT authentication",
         "Sử dụng Celery cho async",
         "Follow security best practices"
-    ],
+    ),
     cv_tips="Highlight DRF, Celery experience",
     market_demand=MarketDemand.HIGH,
     salary_range_vnd="15-45 triệu",
     experience_level="all",
-    keywords=["django", "drf", "orm", "celery", "admin"]
+    keywords=("django", "drf", "orm", "celery", "admin")
 ))
 
 _register_skill(Skill(
     id="fastapi",
     name="FastAPI",
     category=SkillCategory.BACKEND_FRAMEWORK,
-    aliases=["fast-api", "fast api"],
-    related_skills=["python", "pydantic", "async", "openapi"],
-    parent_skills=["python"],
-    child_skills=[],
+    aliases=("fast-api", "fast api"),
+    related_skills=("python", "pydantic", "async", "openapi"),
+    parent_skills=("python",),
+    child_skills=(),
     description="Modern Python framework, async, auto-docs, type hints.",
     learning_path="Python async → FastAPI basics → Pydantic → Background tasks",
-    best_practices=[
+    best_practices=(
         "Use Pydantic models",
         "Implement dependency injection",
         "Leverage async/await",
         "Auto-generate OpenAPI docs"
-    ],
+    ),
     cv_tips="FastAPI đang lên, rất hot cho microservices",
     market_demand=MarketDemand.HIGH,
     salary_range_vnd="18-50 triệu",
     experience_level="mid",
-    keywords=["fastapi", "pydantic", "async", "openapi", "uvicorn"]
+    keywords=("fastapi", "pydantic", "async", "openapi", "uvicorn")
 ))
 
 _register_skill(Skill(
     id="spring-boot",
     name="Spring Boot",
     category=SkillCategory.BACKEND_FRAMEWORK,
-    aliases=["springboot", "spring-boot", "spring boot", "spring"],
-    related_skills=["java", "hibernate", "maven", "microservices"],
-    parent_skills=["java"],
-    child_skills=["spring-cloud"],
+    aliases=("springboot", "spring-boot", "spring boot", "spring"),
+    related_skills=("java", "hibernate", "maven", "microservices"),
+    parent_skills=("java",),
+    child_skills=("spring-cloud",),
     description="Java framework phổ biến nhất cho enterprise backend.",
     learning_path="Java Core → Spring basics → Spring Boot → Security → Cloud",
-    best_practices=[
+    best_practices=(
         "Use Spring Initializr",
         "Implement proper layering",
         "Use Spring Security",
         "Follow 12-factor app"
-    ],
+    ),
     cv_tips="Spring Boot gần như bắt buộc cho Java backend roles",
     market_demand=MarketDemand.VERY_HIGH,
     salary_range_vnd="18-55 triệu",
     experience_level="all",
-    keywords=["spring", "boot", "bean", "autowired", "jpa"]
+    keywords=("spring", "boot", "bean", "autowired", "jpa")
 ))
 
 # ===== DATABASES =====
@@ -504,115 +812,115 @@ _register_skill(Skill(
     id="postgresql",
     name="PostgreSQL",
     category=SkillCategory.DATABASE,
-    aliases=["postgres", "psql", "pg", "postgre"],
-    related_skills=["sql", "database-design", "indexing"],
-    parent_skills=["sql"],
-    child_skills=[],
+    aliases=("postgres", "psql", "pg", "postgre"),
+    related_skills=("sql", "database-design", "indexing"),
+    parent_skills=("sql",),
+    child_skills=(),
     description="Open-source relational database mạnh nhất, hỗ trợ JSON, full-text search.",
     learning_path="SQL basics → Indexing → Query optimization → Replication → Tuning",
-    best_practices=[
+    best_practices=(
         "Proper indexing strategy",
         "Use EXPLAIN ANALYZE",
         "Connection pooling (PgBouncer)",
         "Regular VACUUM"
-    ],
+    ),
     cv_tips="Ghi cụ thể: query optimization, millions of records, replication",
     market_demand=MarketDemand.VERY_HIGH,
     salary_range_vnd="Đi kèm Backend role",
     experience_level="all",
-    keywords=["postgresql", "postgres", "sql", "query", "index"]
+    keywords=("postgresql", "postgres", "sql", "query", "index")
 ))
 
 _register_skill(Skill(
     id="mysql",
     name="MySQL",
     category=SkillCategory.DATABASE,
-    aliases=["my-sql", "mariadb"],
-    related_skills=["sql", "database-design"],
-    parent_skills=["sql"],
-    child_skills=[],
+    aliases=("my-sql", "mariadb"),
+    related_skills=("sql", "database-design"),
+    parent_skills=("sql",),
+    child_skills=(),
     description="Relational database phổ biến, dễ sử dụng, widespread adoption.",
     learning_path="SQL basics → Indexing → Optimization → Replication",
-    best_practices=[
+    best_practices=(
         "Use InnoDB engine",
         "Proper indexing",
         "Optimize slow queries",
         "Regular backups"
-    ],
+    ),
     cv_tips="MySQL phổ biến nhưng PostgreSQL đang được ưa chuộng hơn",
     market_demand=MarketDemand.HIGH,
     salary_range_vnd="Đi kèm Backend role",
     experience_level="all",
-    keywords=["mysql", "sql", "mariadb", "innodb"]
+    keywords=("mysql", "sql", "mariadb", "innodb")
 ))
 
 _register_skill(Skill(
     id="mongodb",
     name="MongoDB",
     category=SkillCategory.DATABASE,
-    aliases=["mongo", "nosql", "document db"],
-    related_skills=["mongoose", "nosql", "aggregation"],
-    parent_skills=[],
-    child_skills=[],
+    aliases=("mongo", "nosql", "document db"),
+    related_skills=("mongoose", "nosql", "aggregation"),
+    parent_skills=(),
+    child_skills=(),
     description="Document database phổ biến nhất, linh hoạt, rapid development.",
     learning_path="CRUD → Aggregation → Indexing → Replication → Sharding",
-    best_practices=[
+    best_practices=(
         "Design schema for queries",
         "Proper indexing",
         "Avoid large documents",
         "Use aggregation pipeline"
-    ],
+    ),
     cv_tips="Highlight large datasets, aggregation pipeline experience",
     market_demand=MarketDemand.HIGH,
     salary_range_vnd="Đi kèm Backend role",
     experience_level="all",
-    keywords=["mongodb", "mongo", "document", "nosql", "aggregation"]
+    keywords=("mongodb", "mongo", "document", "nosql", "aggregation")
 ))
 
 _register_skill(Skill(
     id="redis",
     name="Redis",
     category=SkillCategory.DATABASE,
-    aliases=["redis cache", "in-memory", "redis db"],
-    related_skills=["caching", "pub-sub", "session"],
-    parent_skills=[],
-    child_skills=[],
+    aliases=("redis cache", "in-memory", "redis db"),
+    related_skills=("caching", "pub-sub", "session"),
+    parent_skills=(),
+    child_skills=(),
     description="In-memory data store cho caching, sessions, real-time.",
     learning_path="Data structures → Caching patterns → Pub/Sub → Clustering",
-    best_practices=[
+    best_practices=(
         "Set appropriate TTL",
         "Use data structures properly",
         "Cache invalidation strategy",
         "Monitor memory"
-    ],
+    ),
     cv_tips="Redis thường yêu cầu cho Senior Backend roles",
     market_demand=MarketDemand.HIGH,
     salary_range_vnd="Đi kèm Backend role",
     experience_level="mid",
-    keywords=["redis", "cache", "memory", "pub/sub", "session"]
+    keywords=("redis", "cache", "memory", "pub/sub", "session")
 ))
 
 _register_skill(Skill(
     id="elasticsearch",
     name="Elasticsearch",
     category=SkillCategory.DATABASE,
-    aliases=["elastic", "es", "elk", "opensearch"],
-    related_skills=["full-text-search", "logging", "kibana"],
-    parent_skills=[],
-    child_skills=[],
+    aliases=("elastic", "es", "elk", "opensearch"),
+    related_skills=("full-text-search", "logging", "kibana"),
+    parent_skills=(),
+    child_skills=(),
     description="Search và analytics engine, dùng cho full-text search, logging (ELK).",
     learning_path="Basics → Queries → Mappings → Aggregations → Clustering",
-    best_practices=[
+    best_practices=(
         "Proper index mapping",
         "Use bulk operations",
         "Optimize queries",
         "Monitor cluster health"
-    ],
+    ),
     cv_tips="Elasticsearch valuable cho search-heavy và logging systems",
     market_demand=MarketDemand.HIGH,
     salary_range_vnd="Đi kèm Senior Backend/DevOps role",
     experience_level="mid",
-    keywords=["elasticsearch", "elastic", "search", "kibana", "logstash"]
+    keywords=("elasticsearch", "elastic", "search", "kibana", "logstash")
 ))
 
 # ===== DEVOPS =====
@@ -621,115 +929,115 @@ _register_skill(Skill(
     id="docker",
     name="Docker",
     category=SkillCategory.DEVOPS,
-    aliases=["docker-compose", "containerization", "container"],
-    related_skills=["kubernetes", "ci-cd", "linux"],
-    parent_skills=["linux"],
-    child_skills=["kubernetes", "docker-compose"],
+    aliases=("docker-compose", "containerization", "container"),
+    related_skills=("kubernetes", "ci-cd", "linux"),
+    parent_skills=("linux",),
+    child_skills=("kubernetes", "docker-compose"),
     description="Container platform, đóng gói và deploy applications nhất quán.",
     learning_path="Docker basics → Dockerfile → Docker Compose → Orchestration (K8s)",
-    best_practices=[
+    best_practices=(
         "Multi-stage builds",
         "Minimize image size",
         "Don't run as root",
         "Use .dockerignore"
-    ],
+    ),
     cv_tips="Docker gần như bắt buộc cho Senior roles",
     market_demand=MarketDemand.VERY_HIGH,
     salary_range_vnd="Đi kèm Backend/DevOps role",
     experience_level="mid",
-    keywords=["docker", "container", "dockerfile", "compose", "image"]
+    keywords=("docker", "container", "dockerfile", "compose", "image")
 ))
 
 _register_skill(Skill(
     id="kubernetes",
     name="Kubernetes",
     category=SkillCategory.DEVOPS,
-    aliases=["k8s", "kube", "k8", "kubernetes cluster"],
-    related_skills=["docker", "helm", "aws-eks", "gke"],
-    parent_skills=["docker", "linux"],
-    child_skills=["helm", "istio"],
+    aliases=("k8s", "kube", "k8", "kubernetes cluster"),
+    related_skills=("docker", "helm", "aws-eks", "gke"),
+    parent_skills=("docker", "linux"),
+    child_skills=("helm", "istio"),
     description="Container orchestration platform, industry standard cho scaling.",
     learning_path="K8s concepts → Deployments & Services → Helm → Monitoring → GitOps",
-    best_practices=[
+    best_practices=(
         "Use Helm",
         "Implement health checks",
         "Set resource limits",
         "Follow GitOps"
-    ],
+    ),
     cv_tips="K8s rất valuable, có CKA/CKAD certification càng tốt",
     market_demand=MarketDemand.VERY_HIGH,
     salary_range_vnd="25-70 triệu (DevOps/SRE)",
     experience_level="mid",
-    keywords=["kubernetes", "k8s", "pod", "deployment", "service", "helm"]
+    keywords=("kubernetes", "k8s", "pod", "deployment", "service", "helm")
 ))
 
 _register_skill(Skill(
     id="ci-cd",
     name="CI/CD",
     category=SkillCategory.DEVOPS,
-    aliases=["cicd", "continuous integration", "continuous deployment", "pipeline"],
-    related_skills=["github-actions", "jenkins", "gitlab-ci"],
-    parent_skills=["git"],
-    child_skills=["github-actions", "jenkins"],
+    aliases=("cicd", "continuous integration", "continuous deployment", "pipeline"),
+    related_skills=("github-actions", "jenkins", "gitlab-ci"),
+    parent_skills=("git",),
+    child_skills=("github-actions", "jenkins"),
     description="Continuous Integration & Deployment, automation cho build và deploy.",
     learning_path="Git → CI basics → CD basics → Advanced pipelines → GitOps",
-    best_practices=[
+    best_practices=(
         "Automate everything",
         "Fast feedback loops",
         "Implement testing stages",
         "Use infrastructure as code"
-    ],
+    ),
     cv_tips="CI/CD experience quan trọng, ghi cụ thể tools đã dùng",
     market_demand=MarketDemand.VERY_HIGH,
     salary_range_vnd="Đi kèm DevOps role",
     experience_level="mid",
-    keywords=["ci/cd", "pipeline", "jenkins", "github actions", "gitlab ci"]
+    keywords=("ci/cd", "pipeline", "jenkins", "github actions", "gitlab ci")
 ))
 
 _register_skill(Skill(
     id="github-actions",
     name="GitHub Actions",
     category=SkillCategory.DEVOPS,
-    aliases=["gh actions", "github action"],
-    related_skills=["ci-cd", "git", "docker"],
-    parent_skills=["git", "ci-cd"],
-    child_skills=[],
+    aliases=("gh actions", "github action"),
+    related_skills=("ci-cd", "git", "docker"),
+    parent_skills=("git", "ci-cd"),
+    child_skills=(),
     description="CI/CD platform của GitHub, dễ sử dụng và free cho open source.",
     learning_path="Workflows → Jobs & Steps → Secrets → Matrix builds → Reusable workflows",
-    best_practices=[
+    best_practices=(
         "Use reusable workflows",
         "Cache dependencies",
         "Use matrix for multiple versions",
         "Implement proper secrets management"
-    ],
+    ),
     cv_tips="GitHub Actions phổ biến, nên có kinh nghiệm",
     market_demand=MarketDemand.HIGH,
     salary_range_vnd="Đi kèm DevOps role",
     experience_level="all",
-    keywords=["github actions", "workflow", "yaml", "automation"]
+    keywords=("github actions", "workflow", "yaml", "automation")
 ))
 
 _register_skill(Skill(
     id="terraform",
     name="Terraform",
     category=SkillCategory.DEVOPS,
-    aliases=["tf", "terraform cloud", "hcl"],
-    related_skills=["aws", "gcp", "azure", "infrastructure-as-code"],
-    parent_skills=["cloud"],
-    child_skills=[],
+    aliases=("tf", "terraform cloud", "hcl"),
+    related_skills=("aws", "gcp", "azure", "infrastructure-as-code"),
+    parent_skills=("cloud",),
+    child_skills=(),
     description="Infrastructure as Code tool, multi-cloud support.",
     learning_path="IaC concepts → Terraform basics → Modules → State management → Multi-env",
-    best_practices=[
+    best_practices=(
         "Use modules",
         "Remote state with locking",
         "Use workspaces/environments",
         "Implement proper testing"
-    ],
+    ),
     cv_tips="Terraform rất valuable cho DevOps/Cloud roles",
     market_demand=MarketDemand.HIGH,
     salary_range_vnd="25-60 triệu (DevOps)",
     experience_level="mid",
-    keywords=["terraform", "hcl", "infrastructure", "iac", "module"]
+    keywords=("terraform", "hcl", "infrastructure", "iac", "module")
 ))
 
 # ===== CLOUD =====
@@ -738,69 +1046,69 @@ _register_skill(Skill(
     id="aws",
     name="AWS",
     category=SkillCategory.CLOUD,
-    aliases=["amazon web services", "aws cloud", "amazon aws"],
-    related_skills=["ec2", "s3", "rds", "lambda", "eks"],
-    parent_skills=[],
-    child_skills=["ec2", "s3", "lambda", "eks"],
+    aliases=("amazon web services", "aws cloud", "amazon aws"),
+    related_skills=("ec2", "s3", "rds", "lambda", "eks"),
+    parent_skills=(),
+    child_skills=("ec2", "s3", "lambda", "eks"),
     description="Cloud platform lớn nhất thế giới, 200+ services.",
     learning_path="Core (EC2, S3, RDS) → Networking (VPC) → Serverless → Containers → IaC",
-    best_practices=[
+    best_practices=(
         "Follow Well-Architected Framework",
         "IAM least privilege",
         "Use IaC (Terraform/CDK)",
         "Monitor với CloudWatch"
-    ],
+    ),
     cv_tips="AWS certifications (SAA, SAP) rất valuable",
     market_demand=MarketDemand.VERY_HIGH,
     salary_range_vnd="20-70 triệu",
     experience_level="all",
-    keywords=["aws", "ec2", "s3", "lambda", "cloudformation", "iam"]
+    keywords=("aws", "ec2", "s3", "lambda", "cloudformation", "iam")
 ))
 
 _register_skill(Skill(
     id="gcp",
     name="Google Cloud Platform",
     category=SkillCategory.CLOUD,
-    aliases=["gcp", "google cloud", "gcloud"],
-    related_skills=["gke", "bigquery", "cloud-run"],
-    parent_skills=[],
-    child_skills=["gke", "bigquery"],
+    aliases=("gcp", "google cloud", "gcloud"),
+    related_skills=("gke", "bigquery", "cloud-run"),
+    parent_skills=(),
+    child_skills=("gke", "bigquery"),
     description="Cloud platform của Google, mạnh về data và ML.",
     learning_path="Core services → GKE → BigQuery → ML services → IaC",
-    best_practices=[
+    best_practices=(
         "Use managed services",
         "Implement proper IAM",
         "Leverage BigQuery",
         "Use Cloud Run for serverless"
-    ],
+    ),
     cv_tips="GCP phổ biến ở các tech companies lớn",
     market_demand=MarketDemand.HIGH,
     salary_range_vnd="20-65 triệu",
     experience_level="mid",
-    keywords=["gcp", "gke", "bigquery", "cloud run", "firebase"]
+    keywords=("gcp", "gke", "bigquery", "cloud run", "firebase")
 ))
 
 _register_skill(Skill(
     id="azure",
     name="Microsoft Azure",
     category=SkillCategory.CLOUD,
-    aliases=["azure cloud", "ms azure"],
-    related_skills=["azure-devops", "aks", "azure-functions"],
-    parent_skills=[],
-    child_skills=["aks", "azure-functions"],
+    aliases=("azure cloud", "ms azure"),
+    related_skills=("azure-devops", "aks", "azure-functions"),
+    parent_skills=(),
+    child_skills=("aks", "azure-functions"),
     description="Cloud platform của Microsoft, mạnh trong enterprise.",
     learning_path="Core services → AKS → Azure DevOps → IaC → Security",
-    best_practices=[
+    best_practices=(
         "Use Azure AD properly",
         "Implement proper networking",
         "Use managed services",
         "Integrate với Azure DevOps"
-    ],
+    ),
     cv_tips="Azure phổ biến trong enterprise và .NET stack",
     market_demand=MarketDemand.HIGH,
     salary_range_vnd="20-60 triệu",
     experience_level="mid",
-    keywords=["azure", "aks", "azure devops", "azure functions"]
+    keywords=("azure", "aks", "azure devops", "azure functions")
 ))
 
 # ===== ARCHITECTURE & PATTERNS =====
@@ -809,92 +1117,92 @@ _register_skill(Skill(
     id="microservices",
     name="Microservices",
     category=SkillCategory.ARCHITECTURE,
-    aliases=["microservice architecture", "distributed systems", "micro-services"],
-    related_skills=["docker", "kubernetes", "api-gateway", "kafka"],
-    parent_skills=["system-design"],
-    child_skills=[],
+    aliases=("microservice architecture", "distributed systems", "micro-services"),
+    related_skills=("docker", "kubernetes", "api-gateway", "kafka"),
+    parent_skills=("system-design",),
+    child_skills=(),
     description="Kiến trúc chia app thành services nhỏ, độc lập, dễ scale.",
     learning_path="Monolith → Service decomposition → Communication → Observability",
-    best_practices=[
+    best_practices=(
         "Design for failure",
         "Distributed tracing",
         "Event-driven where appropriate",
         "Avoid distributed monolith"
-    ],
+    ),
     cv_tips="Highlight số services đã design/maintain, patterns đã dùng",
     market_demand=MarketDemand.VERY_HIGH,
     salary_range_vnd="25-70 triệu (Senior/Architect)",
     experience_level="senior",
-    keywords=["microservices", "distributed", "service mesh", "api gateway"]
+    keywords=("microservices", "distributed", "service mesh", "api gateway")
 ))
 
 _register_skill(Skill(
     id="rest-api",
     name="REST API",
     category=SkillCategory.ARCHITECTURE,
-    aliases=["restful", "rest", "restful api", "api design"],
-    related_skills=["http", "json", "openapi", "swagger"],
-    parent_skills=[],
-    child_skills=["graphql"],
+    aliases=("restful", "rest", "restful api", "api design"),
+    related_skills=("http", "json", "openapi", "swagger"),
+    parent_skills=(),
+    child_skills=("graphql",),
     description="Architectural style cho web APIs, sử dụng HTTP methods.",
     learning_path="HTTP basics → REST principles → API design → Versioning → Documentation",
-    best_practices=[
+    best_practices=(
         "Follow REST conventions",
         "Proper HTTP status codes",
         "Version APIs",
         "Document với OpenAPI/Swagger"
-    ],
+    ),
     cv_tips="REST API là basic requirement, nên có thêm GraphQL",
     market_demand=MarketDemand.VERY_HIGH,
     salary_range_vnd="Đi kèm Backend role",
     experience_level="all",
-    keywords=["rest", "api", "http", "json", "swagger", "openapi"]
+    keywords=("rest", "api", "http", "json", "swagger", "openapi")
 ))
 
 _register_skill(Skill(
     id="graphql",
     name="GraphQL",
     category=SkillCategory.ARCHITECTURE,
-    aliases=["graph-ql", "gql"],
-    related_skills=["apollo", "rest-api", "nodejs"],
-    parent_skills=["rest-api"],
-    child_skills=[],
+    aliases=("graph-ql", "gql"),
+    related_skills=("apollo", "rest-api", "nodejs"),
+    parent_skills=("rest-api",),
+    child_skills=(),
     description="Query language cho APIs, client định nghĩa data cần lấy.",
     learning_path="GraphQL basics → Schemas → Resolvers → Apollo → Best practices",
-    best_practices=[
+    best_practices=(
         "Design schema carefully",
         "Implement proper caching",
         "Use DataLoader for N+1",
         "Implement proper error handling"
-    ],
+    ),
     cv_tips="GraphQL experience làm CV nổi bật, đặc biệt với Apollo",
     market_demand=MarketDemand.HIGH,
     salary_range_vnd="Đi kèm Backend role",
     experience_level="mid",
-    keywords=["graphql", "apollo", "query", "mutation", "schema"]
+    keywords=("graphql", "apollo", "query", "mutation", "schema")
 ))
 
 _register_skill(Skill(
     id="system-design",
     name="System Design",
     category=SkillCategory.ARCHITECTURE,
-    aliases=["system architecture", "software architecture", "hld"],
-    related_skills=["microservices", "distributed-systems", "scalability"],
-    parent_skills=[],
-    child_skills=["microservices"],
+    aliases=("system architecture", "software architecture", "hld"),
+    related_skills=("microservices", "distributed-systems", "scalability"),
+    parent_skills=(),
+    child_skills=("microservices",),
     description="Kỹ năng thiết kế hệ thống lớn, scalable, reliable.",
     learning_path="Fundamentals → Common patterns → Case studies → Trade-offs analysis",
-    best_practices=[
+    best_practices=(
         "Understand requirements first",
         "Consider scalability from start",
         "Design for failure",
         "Document decisions (ADRs)"
-    ],
+    ),
     cv_tips="System design là key cho Senior+ roles, highlight các hệ thống đã design",
     market_demand=MarketDemand.VERY_HIGH,
     salary_range_vnd="30-100+ triệu (Senior/Architect)",
     experience_level="senior",
-    keywords=["system design", "architecture", "scalability", "reliability"]
+    keywords=("system design", "architecture", "scalability", "reliability")
 ))
 
 # ===== MESSAGE QUEUES =====
@@ -903,46 +1211,46 @@ _register_skill(Skill(
     id="kafka",
     name="Apache Kafka",
     category=SkillCategory.MESSAGE_QUEUE,
-    aliases=["kafka", "event streaming", "confluent"],
-    related_skills=["event-driven", "microservices", "stream-processing"],
-    parent_skills=["microservices"],
-    child_skills=[],
+    aliases=("kafka", "event streaming", "confluent"),
+    related_skills=("event-driven", "microservices", "stream-processing"),
+    parent_skills=("microservices",),
+    child_skills=(),
     description="Distributed event streaming platform cho real-time data pipelines.",
     learning_path="Kafka basics → Producers/Consumers → Partitioning → Streams → Connect",
-    best_practices=[
+    best_practices=(
         "Proper partitioning",
         "Idempotent consumers",
         "Schema registry",
         "Monitor consumer lag"
-    ],
+    ),
     cv_tips="Kafka experience rất valuable cho big tech companies",
     market_demand=MarketDemand.HIGH,
     salary_range_vnd="25-60 triệu (Senior)",
     experience_level="mid",
-    keywords=["kafka", "topic", "partition", "consumer", "producer"]
+    keywords=("kafka", "topic", "partition", "consumer", "producer")
 ))
 
 _register_skill(Skill(
     id="rabbitmq",
     name="RabbitMQ",
     category=SkillCategory.MESSAGE_QUEUE,
-    aliases=["rabbit", "amqp"],
-    related_skills=["message-queue", "async", "microservices"],
-    parent_skills=[],
-    child_skills=[],
+    aliases=("rabbit", "amqp"),
+    related_skills=("message-queue", "async", "microservices"),
+    parent_skills=(),
+    child_skills=(),
     description="Message broker phổ biến, dễ setup và sử dụng.",
     learning_path="Basics → Exchanges → Queues → Routing → Clustering",
-    best_practices=[
+    best_practices=(
         "Use proper exchange types",
         "Implement dead letter queues",
         "Handle message acknowledgments",
         "Monitor queue depths"
-    ],
+    ),
     cv_tips="RabbitMQ là entry point tốt cho message queues",
     market_demand=MarketDemand.MEDIUM,
     salary_range_vnd="Đi kèm Backend role",
     experience_level="mid",
-    keywords=["rabbitmq", "queue", "exchange", "amqp", "message"]
+    keywords=("rabbitmq", "queue", "exchange", "amqp", "message")
 ))
 
 # ===== TESTING =====
@@ -951,23 +1259,23 @@ _register_skill(Skill(
     id="unit-testing",
     name="Unit Testing",
     category=SkillCategory.TESTING,
-    aliases=["unit test", "testing", "tdd"],
-    related_skills=["jest", "pytest", "junit", "mocha"],
-    parent_skills=[],
-    child_skills=["integration-testing"],
+    aliases=("unit test", "testing", "tdd"),
+    related_skills=("jest", "pytest", "junit", "mocha"),
+    parent_skills=(),
+    child_skills=("integration-testing",),
     description="Testing individual units of code để đảm bảo correctness.",
     learning_path="Testing fundamentals → Mocking → TDD → Coverage → Best practices",
-    best_practices=[
+    best_practices=(
         "Write tests first (TDD)",
         "Follow AAA pattern",
         "Mock external dependencies",
         "Aim for high coverage"
-    ],
+    ),
     cv_tips="Testing skills quan trọng, ghi rõ tools và coverage đạt được",
     market_demand=MarketDemand.VERY_HIGH,
     salary_range_vnd="Đi kèm mọi dev role",
     experience_level="all",
-    keywords=["unit test", "testing", "tdd", "mock", "coverage"]
+    keywords=("unit test", "testing", "tdd", "mock", "coverage")
 ))
 
 # ===== VERSION CONTROL =====
@@ -976,23 +1284,23 @@ _register_skill(Skill(
     id="git",
     name="Git",
     category=SkillCategory.VERSION_CONTROL,
-    aliases=["github", "gitlab", "bitbucket", "version control"],
-    related_skills=["github", "gitlab", "ci-cd"],
-    parent_skills=[],
-    child_skills=["github-actions", "gitlab-ci"],
+    aliases=("github", "gitlab", "bitbucket", "version control"),
+    related_skills=("github", "gitlab", "ci-cd"),
+    parent_skills=(),
+    child_skills=("github-actions", "gitlab-ci"),
     description="Version control system phổ biến nhất, bắt buộc cho mọi developer.",
     learning_path="Basic commands → Branching → Merging → Rebasing → Git Flow",
-    best_practices=[
+    best_practices=(
         "Meaningful commit messages",
         "Use feature branches",
         "Regular small commits",
         "Code review process"
-    ],
+    ),
     cv_tips="Git là bắt buộc, không cần list riêng trừ khi junior",
     market_demand=MarketDemand.VERY_HIGH,
     salary_range_vnd="Bắt buộc",
     experience_level="all",
-    keywords=["git", "github", "gitlab", "commit", "branch", "merge"]
+    keywords=("git", "github", "gitlab", "commit", "branch", "merge")
 ))
 
 # ===== SOFT SKILLS =====
@@ -1001,23 +1309,23 @@ _register_skill(Skill(
     id="agile",
     name="Agile/Scrum",
     category=SkillCategory.METHODOLOGY,
-    aliases=["scrum", "agile methodology", "kanban", "sprint"],
-    related_skills=["jira", "confluence", "project-management"],
-    parent_skills=[],
-    child_skills=[],
+    aliases=("scrum", "agile methodology", "kanban", "sprint"),
+    related_skills=("jira", "confluence", "project-management"),
+    parent_skills=(),
+    child_skills=(),
     description="Phương pháp phát triển linh hoạt, Scrum là framework phổ biến nhất.",
     learning_path="Agile principles → Scrum → Tools (JIRA) → Estimation → Retrospectives",
-    best_practices=[
+    best_practices=(
         "Active ceremony participation",
         "Proper estimation",
         "Regular retrospectives",
         "Focus on value delivery"
-    ],
+    ),
     cv_tips="Agile/Scrum thường được assume, ghi nếu có certification",
     market_demand=MarketDemand.VERY_HIGH,
     salary_range_vnd="Required",
     experience_level="all",
-    keywords=["agile", "scrum", "sprint", "kanban", "standup"]
+    keywords=("agile", "scrum", "sprint", "kanban", "standup")
 ))
 
 # ===== AI/ML =====
@@ -1026,72 +1334,106 @@ _register_skill(Skill(
     id="machine-learning",
     name="Machine Learning",
     category=SkillCategory.AI_ML,
-    aliases=["ml", "ai", "artificial intelligence"],
-    related_skills=["python", "tensorflow", "pytorch", "scikit-learn"],
-    parent_skills=["python", "statistics"],
-    child_skills=["deep-learning", "nlp"],
+    aliases=("ml", "ai", "artificial intelligence"),
+    related_skills=("python", "tensorflow", "pytorch", "scikit-learn"),
+    parent_skills=("python", "statistics"),
+    child_skills=("deep-learning", "nlp"),
     description="Xây dựng models học từ data để predictions/decisions.",
     learning_path="Math foundations → ML algorithms → Framework (sklearn) → Deep Learning",
-    best_practices=[
+    best_practices=(
         "Understand the math",
         "Proper data preprocessing",
         "Cross-validation",
         "Model evaluation"
-    ],
+    ),
     cv_tips="ML roles đòi hỏi projects cụ thể, papers published nếu có",
     market_demand=MarketDemand.VERY_HIGH,
     salary_range_vnd="25-80 triệu",
     experience_level="mid",
-    keywords=["machine learning", "ml", "ai", "model", "training"]
+    keywords=("machine learning", "ml", "ai", "model", "training")
 ))
 
 _register_skill(Skill(
     id="llm",
     name="LLM/GenAI",
     category=SkillCategory.AI_ML,
-    aliases=["large language models", "generative ai", "chatgpt", "gpt"],
-    related_skills=["openai", "langchain", "rag", "prompt-engineering"],
-    parent_skills=["machine-learning"],
-    child_skills=[],
+    aliases=("large language models", "generative ai", "chatgpt", "gpt"),
+    related_skills=("openai", "langchain", "rag", "prompt-engineering"),
+    parent_skills=("machine-learning",),
+    child_skills=(),
     description="Làm việc với Large Language Models như GPT, Claude, Llama.",
     learning_path="LLM basics → Prompt engineering → RAG → Fine-tuning → Agents",
-    best_practices=[
+    best_practices=(
         "Effective prompt engineering",
         "Implement RAG for accuracy",
         "Handle hallucinations",
         "Cost optimization"
-    ],
+    ),
     cv_tips="LLM/GenAI experience rất hot hiện nay, highlight các projects",
     market_demand=MarketDemand.VERY_HIGH,
     salary_range_vnd="30-100 triệu",
     experience_level="mid",
-    keywords=["llm", "gpt", "openai", "langchain", "rag", "prompt"]
+    keywords=("llm", "gpt", "openai", "langchain", "rag", "prompt")
 ))
 
 
+def _build_child_csr() -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Build CSR arrays cho đồ thị parent → child.
+    Cạnh lấy từ child_skills và chiều ngược của parent_skills; tên được
+    resolve qua _lookup_id_or_alias(), tên ngoài ontology bị bỏ qua.
+    """
+    children: List[Set[int]] = [set() for _ in _IDX_TO_SKILL]
+    for idx, skill in enumerate(_IDX_TO_SKILL):
+        for child_name in skill.child_skills:
+            child = _lookup_id_or_alias(child_name.lower())
+            if child is not None:
+                children[idx].add(_ID_TO_IDX[child.id])
+        for parent_name in skill.parent_skills:
+            parent = _lookup_id_or_alias(parent_name.lower())
+            if parent is not None:
+                children[_ID_TO_IDX[parent.id]].add(idx)
+    
+    indptr = np.zeros(len(children) + 1, dtype=np.int32)
+    flat: List[int] = []
+    for idx, child_set in enumerate(children):
+        child_set.discard(idx)
+        flat.extend(sorted(child_set))
+        indptr[idx + 1] = len(flat)
+    return indptr, np.array(flat, dtype=np.int32)
+
+
+_finalize_ontology()
+
+
 # ============================================================================
 # ONTOLOGY QUERY FUNCTIONS
 # ============================================================================
 
 def get_skill(skill_name: str) -> Optional[Skill]:
     """Get skill by name or alias"""
-    normalized = skill_name.lower().strip()
-    
-    # Direct lookup
-    if normalized in SKILL_ONTOLOGY:
-        return SKILL_ONTOLOGY[normalized]
-    
-    # Search in aliases
-    for skill in SKILL_ONTOLOGY.values():
-        if isinstance(skill, Skill):
-            if normalized == skill.name.lower():
-                return skill
-            if normalized in [a.lower() for a in skill.aliases]:
-                return skill
-            if normalized in [k.lower() for k in skill.keywords]:
-                return skill
-    
-    return None
+    if _ONTOLOGY_DIRTY:
+        _refinalize()
+    return _TERM_INDEX.get(skill_name.lower().strip())
+
+
+def get_skills(skill_names: Iterable[str]) -> List[Optional[Skill]]:
+    """get_skill cho cả batch: một lượt map qua _TERM_INDEX, None nếu không tìm thấy"""
+    if _ONTOLOGY_DIRTY:
+        _refinalize()
+    lookup = _TERM_INDEX.get
+    return [lookup(name.lower().strip()) for name in skill_names]
+
+
+def lookup_skill(token: str) -> Optional[Skill]:
+    """
+    Lookup skill theo dạng normalized của token (một dict probe).
+    Khớp các biến thể như "React.js", "react js", "REACTJS", "spring_boot".
+    """
+    skill_id = _NORM_ALIAS.get(_normalize_token(token))
+    if skill_id is None:
+        return None
+    return _IDX_TO_SKILL[_ID_TO_IDX[skill_id]]
 
 
 def normalize_skill_name(skill_name: str) -> str:
@@ -1106,22 +1448,120 @@ def get_related_skills(skill_name: str) -> List[str]:
     """Get related skills for a given skill"""
     skill = get_skill(skill_name)
     if skill:
-        return skill.related_skills
+        return list(skill.related_skills)
     return []
 
 
-def get_skills_by_category(category: SkillCategory) -> List[Skill]:
-    """Get all skills in a category"""
-    skills = []
-    seen_ids = set()
+def get_related_skills_lower(skill: Skill) -> FrozenSet[str]:
+    """related_skills của skill dạng lowercase (precompute, không lower lại mỗi lần gọi)"""
+    if _ONTOLOGY_DIRTY:
+        _refinalize()
+    related = _RELATED_LOWER.get(skill.id)
+    if related is None:
+        related = frozenset(s.lower() for s in skill.related_skills)
+    return related
+
+
+def get_parent_skills_lower(skill: Skill) -> FrozenSet[str]:
+    """parent_skills của skill dạng lowercase (precompute, không lower lại mỗi lần gọi)"""
+    if _ONTOLOGY_DIRTY:
+        _refinalize()
+    parents = _PARENT_LOWER.get(skill.id)
+    if parents is None:
+        parents = frozenset(s.lower() for s in skill.parent_skills)
+    return parents
+
+
+def iter_terms_in_text(text: str, is_lower: bool = False) -> Iterator[Tuple[str, Tuple[str, ...]]]:
+    """
+    Scan text một lượt qua _ALIAS_TRIE.
+    
+    Yield (term, skill_ids) cho mỗi lần name/alias/keyword xuất hiện trong text,
+    với word boundary giống skill matching: term phải đứng đầu text hoặc sau
+    whitespace/,;()[]{} và kết thúc ở cuối text hoặc trước các ký tự đó.
+    is_lower=True khi caller đã lowercase text, bỏ qua một lượt copy.
+    """
+    if _ONTOLOGY_DIRTY:
+        _refinalize()
+    if not is_lower:
+        text = text.lower()
+    n = len(text)
+    
+    # Regex (C-level) nhảy thẳng tới các vị trí bắt đầu hợp lệ thay vì duyệt từng ký tự
+    for match in _TERM_START_RE.finditer(text):
+        start = match.start()
+        node = _ALIAS_TRIE
+        end = start
+        while end < n:
+            node = node.get(text[end])
+            if node is None:
+                break
+            end += 1
+            ids = node.get(_TRIE_END)
+            if ids and (end == n or text[end].isspace() or text[end] in _TERM_DELIMITERS):
+                yield text[start:end], ids
+
+
+def skill_in_text(skill_name: str, text: str) -> bool:
+    """Check name/alias/keyword của một skill có xuất hiện trong text (pattern đã compile sẵn)"""
+    skill = get_skill(skill_name)
+    if not skill:
+        return False
+    return _skill_term_re(skill).search(text) is not None
+
+
+def scan_cv(text: str) -> Set[str]:
+    """Tìm ids của mọi skill có name/alias/keyword xuất hiện trong text"""
+    return {skill_id for _, ids in iter_terms_in_text(text) for skill_id in ids}
+
+
+def get_descendant_skills(skill_name: str) -> List[str]:
+    """
+    Get ids của mọi skill build trên skill này (child, child của child, ...).
+    BFS trên CSR arrays, mỗi tầng xử lý bằng NumPy.
+    """
+    skill = get_skill(skill_name)
+    if not skill:
+        return []
+    
+    start = _ID_TO_IDX[skill.id]
+    visited = np.zeros(len(_IDX_TO_SKILL), dtype=bool)
+    visited[start] = True
+    frontier = np.array([start], dtype=np.int32)
     
-    for skill in SKILL_ONTOLOGY.values():
-        if isinstance(skill, Skill) and skill.id not in seen_ids:
-            if skill.category == category:
-                skills.append(skill)
-                seen_ids.add(skill.id)
+    while frontier.size:
+        children = np.concatenate(
+            [_CHILD_INDICES[_CHILD_INDPTR[i]:_CHILD_INDPTR[i + 1]] for i in frontier]
+        )
+        frontier = np.unique(children[~visited[children]])
+        visited[frontier] = True
     
-    return skills
+    visited[start] = False
+    return [_IDX_TO_SKILL[i].id for i in np.flatnonzero(visited)]
+
+
+def get_skills_by_category(category: SkillCategory) -> Tuple[Skill, ...]:
+    """Get all skills in a category"""
+    if _ONTOLOGY_DIRTY:
+        _refinalize()
+    return _BY_CATEGORY.get(category, ())
+
+
+def get_skills_by_demand(demand: MarketDemand) -> Tuple[Skill, ...]:
+    """Get all skills with a market demand level"""
+    if _ONTOLOGY_DIRTY:
+        _refinalize()
+    return _BY_DEMAND.get(demand, ())
+
+
+def get_category_tag(category_value: str) -> int:
+    """Category tag của một category value (vd. "Database"), value lạ → tag của Other"""
+    return _CATEGORY_TAG_BY_VALUE.get(category_value, _CATEGORY_INT[SkillCategory.OTHER])
+
+
+def get_category_value(tag: int) -> str:
+    """Category value của một category tag"""
+    return _CATEGORY_VALUES[tag]
 
 
 def get_skill_categories() -> List[str]:
@@ -1129,39 +1569,54 @@ def get_skill_categories() -> List[str]:
     return [cat.value for cat in SkillCategory]
 
 
-def get_all_skills() -> List[Skill]:
+def get_all_skills() -> Tuple[Skill, ...]:
     """Get all unique skills"""
-    skills = []
-    seen_ids = set()
-    
-    for skill in SKILL_ONTOLOGY.values():
-        if isinstance(skill, Skill) and skill.id not in seen_ids:
-            skills.append(skill)
-            seen_ids.add(skill.id)
+    if _ONTOLOGY_DIRTY:
+        _refinalize()
+    return _UNIQUE_SKILLS
+
+
+@lru_cache(maxsize=256)
+def search_skills(query: str, limit: Optional[int] = None) -> Tuple[Skill, ...]:
+    """
+    Search skills by query (kết quả được cache theo query, limit).
+    limit: dừng scan khi đủ số kết quả (vd. autocomplete), None = không giới hạn.
+    """
+    if _ONTOLOGY_DIRTY:
+        _refinalize()
+    query = query.lower()
+    # Query chứa separator có thể khớp vắt qua hai term, không term nào chứa nó
+    if _SEARCH_SEP in query:
+        return ()
     
-    return skills
+    # Check name, aliases, keywords
+    matches = (skill for skill, text in zip(_UNIQUE_SKILLS, _SEARCH_TEXT) if query in text)
+    return tuple(islice(matches, limit))
 
 
-def search_skills(query: str) -> List[Skill]:
-    """Search skills by query"""
-    query = query.lower()
-    results = []
-    seen_ids = set()
-    
-    for skill in SKILL_ONTOLOGY.values():
-        if isinstance(skill, Skill) and skill.id not in seen_ids:
-            # Check name, aliases, keywords
-            if query in skill.name.lower():
-                results.append(skill)
-                seen_ids.add(skill.id)
-            elif any(query in alias.lower() for alias in skill.aliases):
-                results.append(skill)
-                seen_ids.add(skill.id)
-            elif any(query in kw.lower() for kw in skill.keywords):
-                results.append(skill)
-                seen_ids.add(skill.id)
+on_ontology_change(search_skills.cache_clear)
+
+
+def search_skills_by_prefix(prefix: str, limit: Optional[int] = None) -> Tuple[Skill, ...]:
+    """Skills có name/alias/keyword bắt đầu bằng prefix (duyệt subtree của _ALIAS_TRIE)"""
+    if _ONTOLOGY_DIRTY:
+        _refinalize()
+    node = _ALIAS_TRIE
+    for char in prefix.lower():
+        node = node.get(char)
+        if node is None:
+            return ()
     
-    return results
+    skill_ids: Set[str] = set()
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        for key, child in node.items():
+            if key == _TRIE_END:
+                skill_ids.update(child)
+            else:
+                stack.append(child)
+    return tuple(islice((skill for skill in _UNIQUE_SKILLS if skill.id in skill_ids), limit))
 
 
 # ============================================================================
@@ -1169,7 +1624,12 @@ def search_skills(query: str) -> List[Skill]:
 # ============================================================================
 
 def export_ontology_to_json() -> str:
-    """Export ontology to JSON format"""
+    """Export ontology to JSON format (serialize một lần rồi cache)"""
+    global _ONTOLOGY_JSON_CACHE
+    
+    if _ONTOLOGY_JSON_CACHE is not None:
+        return _ONTOLOGY_JSON_CACHE
+    
     skills = get_all_skills()
     
     data = {
@@ -1196,7 +1656,11 @@ def export_ontology_to_json() -> str:
         ]
     }
     
-    return json.dumps(data, ensure_ascii=False, indent=2)
+    if HAS_ORJSON:
+        _ONTOLOGY_JSON_CACHE = orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+    else:
+        _ONTOLOGY_JSON_CACHE = json.dumps(data, ensure_ascii=False, indent=2)
+    return _ONTOLOGY_JSON_CACHE
 
 
 # ============================================================================
@@ -1214,7 +1678,7 @@ if __name__ == "__main__":
     if skill:
         print(f"   Name: {skill.name}")
         print(f"   Category: {skill.category.value}")
-        print(f"   Related: {skill.related_skills}")
+        print(f"   Related: {list(skill.related_skills)}")
     
     # Test normalize
     print("\n2. Normalize skill names:")
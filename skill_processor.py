@@ -9,16 +9,33 @@ Module này cung cấp:
 4. Skill Gap Calculation - Tính khoảng cách kỹ năng CV vs JD
 """
 
+import atexit
+import io
+import os
 import re
+import threading
+from bisect import bisect_right
+from sys import intern
 from typing import List, Dict, Set, Tuple, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import repeat
+
+import numpy as np
 
 from skill_ontology import (
     get_skill, 
+    get_skills,
     normalize_skill_name, 
     get_related_skills,
+    get_related_skills_lower,
+    get_parent_skills_lower,
     get_all_skills,
+    get_category_tag,
+    iter_terms_in_text,
+    on_ontology_change,
     Skill,
     SkillCategory,
     MarketDemand
@@ -32,6 +49,8 @@ from skill_ontology import (
 @dataclass
 class ExtractedSkill:
     """Kỹ năng được trích xuất từ text"""
+    __slots__ = ("raw_name", "normalized_name", "category", "confidence", "source", "in_ontology")
+    
     raw_name: str           # Tên gốc trong text
     normalized_name: str    # Tên đã chuẩn hóa
     category: str           # Category từ ontology
@@ -40,9 +59,31 @@ class ExtractedSkill:
     in_ontology: bool      # Có trong ontology không
 
 
+@dataclass
+class ExtractedSkillArrays:
+    """List ExtractedSkill dạng struct-of-arrays, cho các phép tính bulk (mean, mask, ...)"""
+    __slots__ = ("raw_names", "normalized_names", "categories", "confidences", "sources", "in_ontology")
+    
+    raw_names: np.ndarray           # object
+    normalized_names: np.ndarray    # object
+    categories: np.ndarray          # int8 category tag (get_category_tag / get_category_value)
+    confidences: np.ndarray         # float32
+    sources: np.ndarray             # object
+    in_ontology: np.ndarray         # bool
+    
+    def __len__(self) -> int:
+        return len(self.normalized_names)
+
+
 @dataclass
 class SkillGapAnalysis:
     """Kết quả phân tích skill gap"""
+    __slots__ = (
+        "matching_skills", "missing_skills", "extra_skills", "related_missing",
+        "match_percentage", "gap_severity", "matching_by_category", "missing_by_category",
+        "high_priority_missing", "quick_wins",
+    )
+    
     matching_skills: List[str]      # Skills CV có và JD yêu cầu
     missing_skills: List[str]       # Skills JD yêu cầu mà CV không có
     extra_skills: List[str]         # Skills CV có mà JD không yêu cầu
@@ -64,6 +105,14 @@ class SkillGapAnalysis:
 # SKILL EXTRACTION
 # ============================================================================
 
+# "Skills: Python, Java, JavaScript" - compile một lần thay vì mỗi lần extract
+_SKILLS_SECTION_RE = re.compile(
+    r'(?:skills?|technologies?|tech stack|kỹ năng)[\s:]+([^\n]+)',
+    re.IGNORECASE
+)
+_SKILL_DELIMITER_RE = re.compile(r'[,;|•·\-/]|\band\b')
+
+
 def extract_skills_from_text(text: str, source: str = "unknown") -> List[ExtractedSkill]:
     """
     Trích xuất kỹ năng từ văn bản tự do.
@@ -83,61 +132,39 @@ def extract_skills_from_text(text: str, source: str = "unknown") -> List[Extract
     text_lower = text.lower()
     
     # Strategy 1: Match với tất cả skills trong ontology
+    # Scan text một lượt qua trie của ontology, thu các term có mặt trong text
+    found_terms = set()
+    found_ids = set()
+    for term, skill_ids in iter_terms_in_text(text_lower, is_lower=True):
+        found_terms.add(term)
+        found_ids.update(skill_ids)
+    
     all_skills = get_all_skills()
     
     for skill in all_skills:
-        # Check skill name
-        if _find_skill_in_text(skill.name, text_lower):
-            if skill.name not in seen:
+        if skill.id not in found_ids or skill.name in seen:
+            continue
+        # Ưu tiên: name (1.0) → aliases (0.95) → keywords (0.8), term đầu tiên khớp thắng
+        for raw_name, confidence in _iter_skill_terms(skill):
+            if raw_name.lower() in found_terms:
                 extracted.append(ExtractedSkill(
-                    raw_name=skill.name,
+                    raw_name=raw_name,
                     normalized_name=skill.name,
                     category=skill.category.value,
-                    confidence=1.0,
+                    confidence=confidence,
                     source=source,
                     in_ontology=True
                 ))
                 seen.add(skill.name)
-        
-        # Check aliases
-        for alias in skill.aliases:
-            if _find_skill_in_text(alias, text_lower):
-                if skill.name not in seen:
-                    extracted.append(ExtractedSkill(
-                        raw_name=alias,
-                        normalized_name=skill.name,
-                        category=skill.category.value,
-                        confidence=0.95,
-                        source=source,
-                        in_ontology=True
-                    ))
-                    seen.add(skill.name)
-        
-        # Check keywords
-        for keyword in skill.keywords:
-            if _find_skill_in_text(keyword, text_lower):
-                if skill.name not in seen:
-                    extracted.append(ExtractedSkill(
-                        raw_name=keyword,
-                        normalized_name=skill.name,
-                        category=skill.category.value,
-                        confidence=0.8,
-                        source=source,
-                        in_ontology=True
-                    ))
-                    seen.add(skill.name)
+                break
     
     # Strategy 2: Pattern matching cho các format phổ biến
     # "Skills: Python, Java, JavaScript"
-    skills_section = re.findall(
-        r'(?:skills?|technologies?|tech stack|kỹ năng)[\s:]+([^\n]+)',
-        text_lower,
-        re.IGNORECASE
-    )
+    skills_section = _SKILLS_SECTION_RE.findall(text_lower)
     
     for section in skills_section:
         # Split by common delimiters
-        potential_skills = re.split(r'[,;|•·\-/]|\band\b', section)
+        potential_skills = _SKILL_DELIMITER_RE.split(section)
         for ps in potential_skills:
             ps = ps.strip()
             if len(ps) > 1 and len(ps) < 30:  # Reasonable skill name length
@@ -158,7 +185,7 @@ def extract_skills_from_text(text: str, source: str = "unknown") -> List[Extract
                     # Unknown skill - still extract but flag
                     extracted.append(ExtractedSkill(
                         raw_name=ps,
-                        normalized_name=ps.title(),
+                        normalized_name=intern(ps.title()),
                         category="Other",
                         confidence=0.6,
                         source=source,
@@ -169,13 +196,84 @@ def extract_skills_from_text(text: str, source: str = "unknown") -> List[Extract
     return extracted
 
 
-def _find_skill_in_text(skill_name: str, text: str) -> bool:
-    """Check if skill name exists in text (word boundary aware)"""
-    # Escape special regex chars
-    escaped = re.escape(skill_name.lower())
-    # Word boundary match (handle special chars like C++, C#)
-    pattern = r'(?:^|[\s,;()\[\]{}])' + escaped + r'(?:[\s,;()\[\]{}]|$)'
-    return bool(re.search(pattern, text))
+# Với pool đã warm, dispatch tốn ~4ms cố định + ~0.2ms / text, trong khi extract một
+# CV ~1ms: dưới ngưỡng này chạy tuần tự nhanh hơn
+_BATCH_PARALLEL_MIN = 32
+
+# Process pool dùng chung giữa các lần gọi extract_skills_batch, tạo lazily ở batch
+# song song đầu tiên và đóng lúc thoát process
+_BATCH_EXECUTOR: Optional[ProcessPoolExecutor] = None
+_BATCH_EXECUTOR_WORKERS = 0
+_BATCH_EXECUTOR_LOCK = threading.Lock()
+
+
+def _get_batch_executor(workers: int) -> ProcessPoolExecutor:
+    """Pool dùng chung (tạo lại nếu số workers khác lần trước)"""
+    global _BATCH_EXECUTOR, _BATCH_EXECUTOR_WORKERS
+    with _BATCH_EXECUTOR_LOCK:
+        if _BATCH_EXECUTOR is None or _BATCH_EXECUTOR_WORKERS != workers:
+            if _BATCH_EXECUTOR is not None:
+                _BATCH_EXECUTOR.shutdown(wait=False)
+            _BATCH_EXECUTOR = ProcessPoolExecutor(max_workers=workers)
+            _BATCH_EXECUTOR_WORKERS = workers
+        return _BATCH_EXECUTOR
+
+
+def _shutdown_batch_executor():
+    """Đóng pool dùng chung; batch song song kế tiếp tạo pool mới"""
+    global _BATCH_EXECUTOR
+    with _BATCH_EXECUTOR_LOCK:
+        if _BATCH_EXECUTOR is not None:
+            _BATCH_EXECUTOR.shutdown(wait=False)
+            _BATCH_EXECUTOR = None
+
+
+atexit.register(_shutdown_batch_executor)
+# Worker fork giữ ontology lúc fork: bỏ pool cũ để skill mới có trong batch kế tiếp
+on_ontology_change(_shutdown_batch_executor)
+
+
+def extract_skills_batch(
+    texts: List[str],
+    source: str = "unknown",
+    max_workers: Optional[int] = None
+) -> List[List[ExtractedSkill]]:
+    """
+    extract_skills_from_text cho nhiều texts (vd. batch CVs), giữ thứ tự input.
+    
+    Scan trie là Python thuần (giữ GIL) nên batch lớn chạy song song trên một process
+    pool dùng chung. Worker dùng ontology của process cha tại thời điểm fork; với start
+    method "spawn" (mặc định trên Windows / macOS) worker import lại module nên skill
+    đăng ký lúc runtime (_register_skill sau import) không có trong worker.
+    """
+    workers = max_workers or os.cpu_count() or 1
+    if workers == 1 or len(texts) < _BATCH_PARALLEL_MIN:
+        return [extract_skills_from_text(text, source) for text in texts]
+    
+    chunksize = max(1, len(texts) // (workers * 4))
+    pool = _get_batch_executor(workers)
+    return list(pool.map(extract_skills_from_text, texts, repeat(source), chunksize=chunksize))
+
+
+def _iter_skill_terms(skill: Skill):
+    """Yield (term, confidence) của skill theo thứ tự ưu tiên khi match"""
+    yield skill.name, 1.0
+    for alias in skill.aliases:
+        yield alias, 0.95
+    for keyword in skill.keywords:
+        yield keyword, 0.8
+
+
+def to_skill_arrays(extracted: List[ExtractedSkill]) -> ExtractedSkillArrays:
+    """Chuyển kết quả extract_skills_* sang ExtractedSkillArrays"""
+    return ExtractedSkillArrays(
+        raw_names=np.array([s.raw_name for s in extracted], dtype=object),
+        normalized_names=np.array([s.normalized_name for s in extracted], dtype=object),
+        categories=np.array([get_category_tag(s.category) for s in extracted], dtype=np.int8),
+        confidences=np.array([s.confidence for s in extracted], dtype=np.float32),
+        sources=np.array([s.source for s in extracted], dtype=object),
+        in_ontology=np.array([s.in_ontology for s in extracted], dtype=bool)
+    )
 
 
 def extract_skills_from_list(skills_list: List[str], source: str = "unknown") -> List[ExtractedSkill]:
@@ -183,18 +281,23 @@ def extract_skills_from_list(skills_list: List[str], source: str = "unknown") ->
     Normalize và enrich một list skills có sẵn.
     Dùng khi skills đã được parse từ CV/JD JSON.
     """
+    # Copy từng object: kết quả cache dùng chung, caller sửa không được ảnh hưởng lần gọi sau
+    return [replace(s) for s in _extract_skills_from_list_cached(tuple(skills_list), source)]
+
+
+@lru_cache(maxsize=4096)
+def _extract_skills_from_list_cached(
+    skills_list: Tuple[str, ...],
+    source: str
+) -> Tuple[ExtractedSkill, ...]:
+    """extract_skills_from_list, cache theo (skills, source)"""
     extracted = []
     seen = set()
     
-    for raw_skill in skills_list:
-        if not raw_skill or raw_skill.strip() == "":
-            continue
-            
-        raw_skill = raw_skill.strip()
-        
-        # Try to find in ontology
-        skill_obj = get_skill(raw_skill)
-        
+    raw_skills = [s.strip() for s in skills_list if s and s.strip()]
+    
+    # Try to find in ontology (lookup cả batch một lần)
+    for raw_skill, skill_obj in zip(raw_skills, get_skills(raw_skills)):
         if skill_obj:
             if skill_obj.name not in seen:
                 extracted.append(ExtractedSkill(
@@ -208,7 +311,7 @@ def extract_skills_from_list(skills_list: List[str], source: str = "unknown") ->
                 seen.add(skill_obj.name)
         else:
             # Not in ontology - keep original
-            normalized = raw_skill.title()
+            normalized = intern(raw_skill.title())
             if normalized not in seen:
                 extracted.append(ExtractedSkill(
                     raw_name=raw_skill,
@@ -220,13 +323,31 @@ def extract_skills_from_list(skills_list: List[str], source: str = "unknown") ->
                 ))
                 seen.add(normalized)
     
-    return extracted
+    return tuple(extracted)
+
+
+# Skill đăng ký sau import làm kết quả cache lỗi thời → xoá cache
+on_ontology_change(_extract_skills_from_list_cached.cache_clear)
 
 
 # ============================================================================
 # SKILL GAP CALCULATION
 # ============================================================================
 
+# Ngưỡng match % cho gap severity: < 40 critical, < 60 high, < 80 medium, còn lại low
+_SEVERITY_THRESHOLDS = (40, 60, 80)
+_SEVERITY_NAMES = ("critical", "high", "medium", "low")
+_SEVERITY_NAMES_ARRAY = np.array(_SEVERITY_NAMES)
+
+# Market demand tính là high priority khi thiếu
+_HIGH_DEMAND = frozenset((MarketDemand.VERY_HIGH, MarketDemand.HIGH))
+
+
+def classify_gap_severity(match_percentages: np.ndarray) -> np.ndarray:
+    """Gap severity cho cả batch match percentages (cùng ngưỡng với calculate_skill_gap)"""
+    return _SEVERITY_NAMES_ARRAY[np.digitize(match_percentages, _SEVERITY_THRESHOLDS)]
+
+
 def calculate_skill_gap(
     cv_skills: List[str],
     jd_skills: List[str],
@@ -241,44 +362,83 @@ def calculate_skill_gap(
         include_similar_jds_skills: Skills từ similar JDs (optional, cho reference)
     
     Returns:
-        SkillGapAnalysis với đầy đủ thông tin
+        SkillGapAnalysis với đầy đủ thông tin. Tính toán được cache theo
+        (cv_skills, jd_skills), mỗi lần gọi nhận một bản copy riêng.
     """
+    return _copy_skill_gap(_calculate_skill_gap_cached(tuple(cv_skills), tuple(jd_skills)))
+
+
+def _copy_skill_gap(gap: SkillGapAnalysis) -> SkillGapAnalysis:
+    """Copy list / dict của SkillGapAnalysis để caller sửa không làm hỏng bản trong cache"""
+    return SkillGapAnalysis(
+        matching_skills=list(gap.matching_skills),
+        missing_skills=list(gap.missing_skills),
+        extra_skills=list(gap.extra_skills),
+        related_missing={k: list(v) for k, v in gap.related_missing.items()},
+        match_percentage=gap.match_percentage,
+        gap_severity=gap.gap_severity,
+        matching_by_category={k: list(v) for k, v in gap.matching_by_category.items()},
+        missing_by_category={k: list(v) for k, v in gap.missing_by_category.items()},
+        high_priority_missing=list(gap.high_priority_missing),
+        quick_wins=list(gap.quick_wins)
+    )
+
+
+@lru_cache(maxsize=4096)
+def _calculate_skill_gap_cached(
+    cv_skills: Tuple[str, ...],
+    jd_skills: Tuple[str, ...]
+) -> SkillGapAnalysis:
+    """calculate_skill_gap, cache theo cặp (cv_skills, jd_skills)"""
     # Extract và normalize skills
-    cv_extracted = extract_skills_from_list(cv_skills, "cv")
-    jd_extracted = extract_skills_from_list(jd_skills, "jd")
-    
-    # Create sets for comparison (normalized names)
-    cv_normalized = {s.normalized_name.lower() for s in cv_extracted}
-    jd_normalized = {s.normalized_name.lower() for s in jd_extracted}
+    # Chỉ đọc nên dùng thẳng kết quả cache, không cần copy
+    cv_extracted = _extract_skills_from_list_cached(cv_skills, "cv")
+    jd_extracted = _extract_skills_from_list_cached(jd_skills, "jd")
     
-    # Build lookup for original names
+    # Build lookup for original names (lowercase một lần mỗi skill)
     cv_name_map = {s.normalized_name.lower(): s.normalized_name for s in cv_extracted}
     jd_name_map = {s.normalized_name.lower(): s.normalized_name for s in jd_extracted}
     
+    # Create sets for comparison (normalized names) từ keys, không lower lại
+    cv_normalized = {name for name in cv_name_map}
+    jd_normalized = {name for name in jd_name_map}
+    
     # Calculate matching, missing, extra
     matching_lower = cv_normalized & jd_normalized
     missing_lower = jd_normalized - cv_normalized
     extra_lower = cv_normalized - jd_normalized
     
-    # Check for related skills coverage
-    related_missing = {}
-    enhanced_matching = set(matching_lower)
-    
-    for missing in list(missing_lower):
-        missing_skill = get_skill(missing)
-        if missing_skill:
-            # Check if CV has related skills
-            related = set(s.lower() for s in missing_skill.related_skills)
-            cv_has_related = related & cv_normalized
-            
-            if cv_has_related:
-                related_missing[jd_name_map[missing]] = [cv_name_map[r] for r in cv_has_related]
-    
     # Get actual names (not lowercase)
     matching_skills = [jd_name_map.get(m, m) for m in matching_lower]
-    missing_skills = [jd_name_map.get(m, m) for m in missing_lower]
     extra_skills = [cv_name_map.get(e, e) for e in extra_lower]
     
+    # Một lượt qua missing skills: mỗi skill chỉ resolve qua ontology một lần
+    missing_skills = []
+    related_missing = {}
+    high_priority_missing = []
+    quick_wins = []
+    
+    for missing in missing_lower:
+        skill_name = jd_name_map.get(missing, missing)
+        missing_skills.append(skill_name)
+        
+        missing_skill = get_skill(missing)
+        if not missing_skill:
+            continue
+        
+        # High priority: market demand cao
+        if missing_skill.market_demand in _HIGH_DEMAND:
+            high_priority_missing.append(skill_name)
+        
+        # Check if CV has related skills
+        cv_has_related = cv_normalized & get_related_skills_lower(missing_skill)
+        if cv_has_related:
+            related_missing[skill_name] = [cv_name_map[r] for r in cv_has_related]
+        
+        # Quick win: parent skills exist in CV
+        if not get_parent_skills_lower(missing_skill).isdisjoint(cv_normalized):
+            quick_wins.append(skill_name)
+    
     # Calculate match percentage
     if jd_skills:
         # Give partial credit for related skills
@@ -289,39 +449,12 @@ def calculate_skill_gap(
         match_percentage = 100.0
     
     # Determine gap severity
-    if match_percentage >= 80:
-        gap_severity = "low"
-    elif match_percentage >= 60:
-        gap_severity = "medium"
-    elif match_percentage >= 40:
-        gap_severity = "high"
-    else:
-        gap_severity = "critical"
+    gap_severity = _SEVERITY_NAMES[bisect_right(_SEVERITY_THRESHOLDS, match_percentage)]
     
     # Categorize matching and missing
     matching_by_category = _categorize_skills(matching_skills)
     missing_by_category = _categorize_skills(missing_skills)
     
-    # Identify high priority missing (high market demand)
-    high_priority_missing = []
-    for skill_name in missing_skills:
-        skill = get_skill(skill_name)
-        if skill and skill.market_demand in [MarketDemand.VERY_HIGH, MarketDemand.HIGH]:
-            high_priority_missing.append(skill_name)
-    
-    # Identify quick wins (skills that are related to what CV already has)
-    quick_wins = []
-    for skill_name in missing_skills:
-        skill = get_skill(skill_name)
-        if skill:
-            # If parent skills exist in CV, this is a quick win
-            parent_in_cv = any(
-                p.lower() in cv_normalized 
-                for p in skill.parent_skills
-            )
-            if parent_in_cv:
-                quick_wins.append(skill_name)
-    
     return SkillGapAnalysis(
         matching_skills=matching_skills,
         missing_skills=missing_skills,
@@ -336,16 +469,72 @@ def calculate_skill_gap(
     )
 
 
+on_ontology_change(_calculate_skill_gap_cached.cache_clear)
+
+
+def batch_match_percentages(
+    cv_skill_lists: List[List[str]],
+    jd_skill_lists: List[List[str]]
+) -> np.ndarray:
+    """
+    Match percentage cho mọi cặp (CV, JD) trong một batch.
+    
+    Trả về ma trận shape (n_cvs, n_jds), cùng công thức với
+    calculate_skill_gap().match_percentage (base match + 0.3 mỗi missing skill
+    có related skill trong CV, tối đa 100) nhưng chưa round. JD không có skill
+    nào → 100. Các phép giao set được làm bằng matmul trên presence matrix.
+    """
+    cv_sets = [
+        {s.normalized_name.lower() for s in _extract_skills_from_list_cached(tuple(skills), "cv")}
+        for skills in cv_skill_lists
+    ]
+    jd_sets = [
+        {s.normalized_name.lower() for s in _extract_skills_from_list_cached(tuple(skills), "jd")}
+        for skills in jd_skill_lists
+    ]
+    
+    # Vocabulary chung cho batch: normalized name (lowercase) → cột
+    vocab: Dict[str, int] = {}
+    for names in (*cv_sets, *jd_sets):
+        for name in names:
+            vocab.setdefault(name, len(vocab))
+    
+    def _presence(sets: List[Set[str]]) -> np.ndarray:
+        matrix = np.zeros((len(sets), len(vocab)), dtype=np.float64)
+        for row, names in enumerate(sets):
+            matrix[row, [vocab[name] for name in names]] = 1.0
+        return matrix
+    
+    cv_matrix = _presence(cv_sets)
+    jd_matrix = _presence(jd_sets)
+    
+    # cv_has_related[i, k]: CV i có ít nhất một related skill của term k
+    cv_has_related = np.zeros_like(cv_matrix)
+    for name, col in vocab.items():
+        skill = get_skill(name)
+        if skill:
+            related_cols = [vocab[r] for r in get_related_skills_lower(skill) if r in vocab]
+            if related_cols:
+                cv_has_related[:, col] = cv_matrix[:, related_cols].any(axis=1)
+    
+    matching = cv_matrix @ jd_matrix.T
+    related_counts = ((1.0 - cv_matrix) * cv_has_related) @ jd_matrix.T
+    jd_sizes = jd_matrix.sum(axis=1)
+    
+    with np.errstate(divide="ignore", invalid="ignore"):
+        base_match = matching / jd_sizes * 100
+    percentages = np.minimum(100, base_match + related_counts * 0.3)
+    percentages[:, jd_sizes == 0] = 100.0
+    return percentages
+
+
 def _categorize_skills(skill_names: List[str]) -> Dict[str, List[str]]:
     """Group skills by category"""
     categories = {}
     
     for skill_name in skill_names:
         skill = get_skill(skill_name)
-        if skill:
-            cat = skill.category.value
-        else:
-            cat = "Other"
+        cat = skill.category.value if skill else "Other"
         
         if cat not in categories:
             categories[cat] = []
@@ -382,100 +571,102 @@ def enrich_skill_info(skill_name: str) -> Optional[Dict]:
     }
 
 
+@lru_cache(maxsize=4096)
+def _recommendation_items(skill_id: str) -> Tuple[Tuple[str, object], ...]:
+    """Các field recommendation (immutable) của một skill, cache theo skill id"""
+    skill = get_skill(skill_id)
+    return (
+        ("skill", skill.name),
+        ("priority", "high" if skill.market_demand in [MarketDemand.VERY_HIGH, MarketDemand.HIGH] else "medium"),
+        ("learning_path", skill.learning_path),
+        ("prerequisites", skill.parent_skills),
+        ("related_skills_to_learn", skill.related_skills[:3]),
+        ("cv_tip", skill.cv_tips),
+        ("market_demand", skill.market_demand.value)
+    )
+
+
+on_ontology_change(_recommendation_items.cache_clear)
+
+
 def get_learning_recommendations(missing_skills: List[str]) -> List[Dict]:
     """
     Tạo recommendations học tập cho các skills thiếu.
     """
-    recommendations = []
+    # Priority chỉ có 2 mức nên chia 2 bucket (giữ thứ tự input) thay vì sort
+    high_priority = []
+    others = []
     
     for skill_name in missing_skills:
         skill = get_skill(skill_name)
         if skill:
-            recommendations.append({
-                "skill": skill.name,
-                "priority": "high" if skill.market_demand in [MarketDemand.VERY_HIGH, MarketDemand.HIGH] else "medium",
-                "learning_path": skill.learning_path,
-                "prerequisites": skill.parent_skills,
-                "related_skills_to_learn": skill.related_skills[:3],
-                "cv_tip": skill.cv_tips,
-                "market_demand": skill.market_demand.value
-            })
-    
-    # Sort by priority
-    recommendations.sort(key=lambda x: 0 if x["priority"] == "high" else 1)
+            # Dict mới mỗi lần gọi, nội dung lấy từ cache theo skill id
+            rec = dict(_recommendation_items(skill.id))
+            (high_priority if rec["priority"] == "high" else others).append(rec)
     
-    return recommendations
+    high_priority.extend(others)
+    return high_priority
 
 
 # ============================================================================
 # FORMAT OUTPUT FOR LLM/API
 # ============================================================================
 
+_PROMPT_SEPARATOR = "=" * 50
+_PROMPT_HEADER = f"{_PROMPT_SEPARATOR}\n📊 SKILL GAP ANALYSIS\n{_PROMPT_SEPARATOR}\n\n"
+_PROMPT_FOOTER = f"\n{_PROMPT_SEPARATOR}"
+
+
 def format_skill_gap_for_prompt(gap: SkillGapAnalysis) -> str:
     """
     Format skill gap analysis thành string để thêm vào LLM prompt.
     """
-    lines = [
-        "=" * 50,
-        "📊 SKILL GAP ANALYSIS",
-        "=" * 50,
-        "",
-        f"📈 Match Percentage: {gap.match_percentage}%",
-        f"🚦 Gap Severity: {gap.gap_severity.upper()}",
-        "",
-        f"✅ MATCHING SKILLS ({len(gap.matching_skills)}):",
-    ]
+    buf = io.StringIO()
+    w = buf.write
+    
+    # Phần khung cố định ghi bằng một f-string (compile sẵn, không parse lúc chạy)
+    w(
+        f"{_PROMPT_HEADER}"
+        f"📈 Match Percentage: {gap.match_percentage}%\n"
+        f"🚦 Gap Severity: {gap.gap_severity.upper()}\n"
+        f"\n"
+        f"✅ MATCHING SKILLS ({len(gap.matching_skills)}):\n"
+    )
     
     if gap.matching_skills:
         for cat, skills in gap.matching_by_category.items():
-            lines.append(f"   [{cat}]: {', '.join(skills)}")
+            w(f"   [{cat}]: {', '.join(skills)}\n")
     else:
-        lines.append("   None")
+        w("   None\n")
     
-    lines.extend([
-        "",
-        f"❌ MISSING SKILLS ({len(gap.missing_skills)}):",
-    ])
+    w(f"\n❌ MISSING SKILLS ({len(gap.missing_skills)}):\n")
     
     if gap.missing_skills:
         for cat, skills in gap.missing_by_category.items():
-            lines.append(f"   [{cat}]: {', '.join(skills)}")
+            w(f"   [{cat}]: {', '.join(skills)}\n")
     else:
-        lines.append("   None - All required skills present!")
+        w("   None - All required skills present!\n")
     
     if gap.high_priority_missing:
-        lines.extend([
-            "",
-            f"🔴 HIGH PRIORITY MISSING (High Market Demand):",
-            f"   {', '.join(gap.high_priority_missing)}"
-        ])
+        w("\n🔴 HIGH PRIORITY MISSING (High Market Demand):\n")
+        w(f"   {', '.join(gap.high_priority_missing)}\n")
     
     if gap.quick_wins:
-        lines.extend([
-            "",
-            f"💡 QUICK WINS (Easy to learn based on existing skills):",
-            f"   {', '.join(gap.quick_wins)}"
-        ])
+        w("\n💡 QUICK WINS (Easy to learn based on existing skills):\n")
+        w(f"   {', '.join(gap.quick_wins)}\n")
     
     if gap.related_missing:
-        lines.extend([
-            "",
-            "🔗 RELATED SKILLS COVERAGE:",
-        ])
+        w("\n🔗 RELATED SKILLS COVERAGE:\n")
         for missing, related in gap.related_missing.items():
-            lines.append(f"   {missing} → CV has related: {', '.join(related)}")
+            w(f"   {missing} → CV has related: {', '.join(related)}\n")
     
     if gap.extra_skills:
-        lines.extend([
-            "",
-            f"➕ EXTRA SKILLS IN CV ({len(gap.extra_skills)}):",
-            f"   {', '.join(gap.extra_skills[:10])}{'...' if len(gap.extra_skills) > 10 else ''}"
-        ])
+        w(f"\n➕ EXTRA SKILLS IN CV ({len(gap.extra_skills)}):\n")
+        w(f"   {', '.join(gap.extra_skills[:10])}{'...' if len(gap.extra_skills) > 10 else ''}\n")
     
-    lines.append("")
-    lines.append("=" * 50)
+    w(_PROMPT_FOOTER)
     
-    return "\n".join(lines)
+    return buf.getvalue()
 
 
 def format_skill_gap_json(gap: SkillGapAnalysis) -> Dict:
@@ -501,25 +692,31 @@ def format_skill_gap_json(gap: SkillGapAnalysis) -> Dict:
 # ============================================================================
 
 if __name__ == "__main__":
-    print("="*60)
-    print("SKILL PROCESSOR TEST")
-    print("="*60)
+    import sys
+    
+    # Gom output rồi ghi một lần thay vì print/flush từng dòng
+    out: List[str] = []
+    emit = out.append
+    
+    emit("="*60)
+    emit("SKILL PROCESSOR TEST")
+    emit("="*60)
     
     # Test data
     cv_skills = ["Python", "Django", "PostgreSQL", "Git", "Docker", "REST API", "Redis"]
     jd_skills = ["Python", "Go", "Kubernetes", "AWS", "Microservices", "Redis", "Kafka", "Docker"]
     
-    print("\n1. CV Skills:", cv_skills)
-    print("   JD Skills:", jd_skills)
+    emit(f"\n1. CV Skills: {cv_skills}")
+    emit(f"   JD Skills: {jd_skills}")
     
     # Calculate gap
-    print("\n2. Calculating Skill Gap...")
+    emit("\n2. Calculating Skill Gap...")
     gap = calculate_skill_gap(cv_skills, jd_skills)
     
-    print(format_skill_gap_for_prompt(gap))
+    emit(format_skill_gap_for_prompt(gap))
     
     # Test extraction from text
-    print("\n3. Extract skills from text:")
+    emit("\n3. Extract skills from text:")
     text = """
     Senior Backend Developer với 5 năm kinh nghiệm.
     Skills: Python, Django REST Framework, PostgreSQL, Docker, Kubernetes
@@ -527,15 +724,17 @@ if __name__ == "__main__":
     """
     
     extracted = extract_skills_from_text(text, "cv")
-    print(f"   Found {len(extracted)} skills:")
+    emit(f"   Found {len(extracted)} skills:")
     for skill in extracted:
-        print(f"   - {skill.normalized_name} ({skill.category}, confidence: {skill.confidence})")
+        emit(f"   - {skill.normalized_name} ({skill.category}, confidence: {skill.confidence})")
     
     # Test learning recommendations
-    print("\n4. Learning Recommendations for missing skills:")
+    emit("\n4. Learning Recommendations for missing skills:")
     recommendations = get_learning_recommendations(gap.missing_skills[:3])
     for rec in recommendations:
-        print(f"\n   📚 {rec['skill']} (Priority: {rec['priority']})")
-        print(f"      Path: {rec['learning_path'][:80]}...")
-        print(f"      CV Tip: {rec['cv_tip'][:60]}...")
-
+        emit(f"\n   📚 {rec['skill']} (Priority: {rec['priority']})")
+        emit(f"      Path: {rec['learning_path'][:80]}...")
+        emit(f"      CV Tip: {rec['cv_tip'][:60]}...")
+    
+    sys.stdout.write("\n".join(out))
+    sys.stdout.write("\n")